@@ -1,7 +1,11 @@
+import argparse
+import json
 import jsbsim
 import time
 import os
 
+from sst.bench import SUITE, run_suite
+
 def benchmark_jsbsim(num_steps=10000):
     # JSBSim root directory (where models are)
     # The pip installed version usually has these in a specific location
@@ -40,8 +44,59 @@ def benchmark_jsbsim(num_steps=10000):
     print(f"Steps for 1 hour: {steps_for_1_hour}")
     print(f"Estimated real time for 1 hour sim: {estimated_1_hour_sim_time:.2f} s")
 
+def print_summary(results):
+    for key, entry in results.get('steps', {}).items():
+        print(f"{key:>16}: {entry['steps_per_s']:10.0f} steps/s, "
+              f"{entry['us_per_step']:7.2f} us/step, 1h sim in {entry['hour_sim_s']:.1f} s")
+    for name, t in results.get('model_load', {}).items():
+        print(f"load_model {name}: {t * 1e3:.2f} ms")
+    for name, entry in results.get('run_ic', {}).items():
+        print(f"run_ic {name}: {entry['run_ic_s'] * 1e3:.3f} ms, pool reset {entry['pool_reset_s'] * 1e3:.3f} ms")
+    access = results.get('property_access')
+    if access:
+        print(f"Property access ({access['accesses_per_step']} per step, f16):")
+        print(f"  fdm.run() only      : {access['run_us']:8.2f} us/step")
+        print(f"  string lookups      : {access['string_us']:8.2f} us/step ({access['string_us_per_access']:.3f} us/access)")
+        print(f"  resolved handles    : {access['handle_us']:8.2f} us/step ({access['handle_us_per_access']:.3f} us/access)")
+    for key, value in results.get('recorder', {}).items():
+        if key.startswith('overhead'):
+            print(f"recorder {key}: {value:+.2f} us/step")
+    for key, value in results.get('guards', {}).items():
+        if key.startswith('overhead'):
+            print(f"guards {key}: {value:+.2f} us/step")
+    for name, entry in results.get('generators', {}).items():
+        print(f"generator {name}: fresh store {entry['cold_store_s']:.3f} s, "
+              f"warm {entry['warm_s']:.3f} s ({entry['steps_per_s']:.0f} steps/s)")
+    for workers, entry in results.get('scaling', {}).items():
+        print(f"workers={workers}: {entry['scenarios_per_s']:.2f} scenarios/s, "
+              f"speedup {entry['speedup']:.2f}, efficiency {entry['efficiency']:.2f}")
+    for workers, entry in results.get('vecenv', {}).items():
+        print(f"vecenv workers={workers}: {entry['env_steps_per_s']:.1f} env steps/s "
+              f"({entry['physics_steps_per_s']:.0f} physics steps/s)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSBSim data pipeline benchmarks")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--only', nargs='*', choices=list(SUITE), help="run only these benchmarks")
+    parser.add_argument('--workers', type=int, help="scale up to this many worker processes")
+    parser.add_argument('--steps', type=int, default=10000, help="steps per throughput loop")
+    args = parser.parse_args(argv)
+
+    benchmark_jsbsim(args.steps)
+    options = {
+        'steps': {'steps': args.steps},
+        'property_access': {'steps': args.steps},
+        'recorder': {'steps': args.steps},
+        'guards': {'steps': args.steps},
+        'scaling': {'max_workers': args.workers},
+        'vecenv': {'max_workers': args.workers},
+    }
+    results = run_suite(args.only, **options)
+    print_summary(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Results written to {args.json}")
+
 if __name__ == "__main__":
-    try:
-        benchmark_jsbsim()
-    except Exception as e:
-        print(f"Error: {e}")
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import os
+from collections import Counter
+
+import numpy as np
+
+from sst.batch import iter_batch
+from sst.build import BuildCache, outdated
+from sst.catalog import CATALOG, Catalog
+from sst.frames import FT, integrate_velocity, local_track
+from sst.plotting import Layout, PlotJob, render, save_trajectory
+from sst.rollout import run_scenario
+from sst.snapshot import SnapshotStore
+
+# Runs any group of data/scenarios.json, e.g. the 'envelope' sweep
+# (altitude x speed x throttle x maneuver), one .npz per rollout
+
+LAYOUT = Layout(figsize=(10, 8), projection='3d')
+
+# lat/lon 이 없으면 진대기속도와 자세로 추측 항법한다
+VELOCITY_TRACK = ('tas', 'pitch', 'heading')
+
+def has_track(channels):
+    return 'lat' in channels or all(name in channels for name in VELOCITY_TRACK)
+
+def add_track(data):
+    # Local north/east position (ft) from the recorded lat/lon, else dead-reckoned
+    if 'lat' in data:
+        track = local_track(data['lat'], data['lon'], data['h_sl'], unit=FT)
+        data['x'] = track[:, 0]
+        data['y'] = track[:, 1]
+    elif all(name in data for name in VELOCITY_TRACK) and len(data['t']):
+        dt = float(data['t'][1] - data['t'][0]) if len(data['t']) > 1 else 0.0
+        north, east, down = integrate_velocity(data['tas'], np.radians(data['pitch']),
+                                               np.radians(data['heading']), dt)
+        data['x'] = north - north[0]
+        data['y'] = east - east[0]
+        if 'z' not in data and 'h_sl' not in data:
+            data['z'] = down[0] - down
+    return data
+
+def draw_track(ax, data, title):
+    z = data['z'] if 'z' in data else data['h_sl']
+    ax.plot(data['x'], data['y'], z, lw=2, color='blue')
+    ax.set_title(title)
+    ax.set_xlabel('North (ft)')
+    ax.set_ylabel('East (ft)')
+    ax.set_zlabel('Altitude (ft)')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('group', nargs='?', default='envelope', help="catalog group to run")
+    parser.add_argument('--catalog', default=CATALOG, help="scenario catalog (JSON)")
+    parser.add_argument('--out', help="output directory (default: catalog_trajectories/<group>)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--store', help="snapshot store (JSON) shared with the workers; "
+                                        "trim points are solved into it up front")
+    parser.add_argument('--list', action='store_true', help="only list the expanded rollouts")
+    parser.add_argument('--no-plots', action='store_true', help="only save the trajectories (.npz)")
+    parser.add_argument('--force', action='store_true', help="rebuild even up-to-date outputs")
+    args = parser.parse_args(argv)
+
+    entries = Catalog(args.catalog).entries(args.group)
+    if args.list:
+        for entry in entries:
+            s = entry.scenario
+            print(f"{entry.key:<40} {s.altitude_ft:>8g} ft {s.speed_kts:>6g} kts  "
+                  f"throttle={s.throttle}  {s.duration:g} s")
+        print(f"{len(entries)} rollouts")
+        return
+
+    out_dir = args.out or os.path.join('catalog_trajectories', args.group)
+    os.makedirs(out_dir, exist_ok=True)
+    # 스펙/기체/JSBSim 이 그대로인 궤적은 건너뛰므로 중단된 스윕도 이어서 돈다
+    build = BuildCache(out_dir, force=args.force)
+    todo = build.stale(entries)
+    print(f"Generating {len(todo)} trajectories for '{args.group}' "
+          f"({len(entries) - len(todo)} up to date)...")
+    if args.store:
+        # 트림은 부모에서 한 번만 풀고 워커들은 파일에서 읽는다
+        trims = SnapshotStore(args.store).trims
+        failed = trims.prepare((e.scenario.aircraft, e.scenario.altitude_ft, e.scenario.speed_kts)
+                               for e in todo if e.scenario.trim)
+        if failed:
+            print(f"Cannot trim: {failed}")
+            todo = [e for e in todo if not e.scenario.trim or
+                    (e.scenario.aircraft, e.scenario.altitude_ft, e.scenario.speed_kts) not in failed]
+    results = iter_batch(run_scenario, (entry.scenario for entry in todo), args.workers,
+                         store_path=args.store)
+    reasons = Counter()
+    with build:
+        for entry, data in zip(todo, results):
+            reasons[str(data['termination'])] += 1
+            save_trajectory(build.output(entry.key), add_track(data))
+            build.done(entry.key)
+    plots = []
+    for entry in entries:
+        source = build.output(entry.key)
+        if (os.path.exists(source) and has_track(entry.scenario.channels)
+                and outdated(source.replace('.npz', '.png'), source)):
+            plots.append(PlotJob(draw_track, source, source.replace('.npz', '.png'),
+                                 entry.title, LAYOUT))
+    render(plots, skip=args.no_plots)
+    print(f"Saved {len(todo)} trajectories in {out_dir}/")
+    print("Termination: " + ", ".join(f"{reason}={n}" for reason, n in reasons.most_common()))
+
+if __name__ == "__main__":
+    main()
@@ -1,96 +1,61 @@
-import jsbsim
+import argparse
 import os
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
 
-def run_simulation(name, ic_h, ic_v, throttle, maneuvers):
-    jsbsim_path = os.path.dirname(jsbsim.__file__)
-    fdm = jsbsim.FGFDMExec(jsbsim_path)
-    fdm.load_model('f16')
-    
-    fdm.set_property_value('simulation/dt', 1.0/120.0)
-    fdm.set_property_value('ic/h-agl-ft', ic_h)
-    fdm.set_property_value('ic/vc-kts', ic_v)
-    fdm.set_property_value('ic/theta-deg', 0.0)
-    fdm.set_property_value('ic/alpha-deg', 2.0)
-    
-    fdm.run_ic()
-    for _ in range(10): fdm.run() # Warmup
-    
-    fdm.set_property_value('propulsion/engine[0]/set-running', 1)
-    fdm.set_property_value('fcs/throttle-cmd-norm', throttle)
-    
-    data = {'t': [], 'x': [], 'y': [], 'z': [], 'v': [], 'pitch': []}
-    x, y = 0.0, 0.0
-    
-    duration = 20.0
-    while fdm.get_sim_time() < duration:
-        t = fdm.get_sim_time()
-        
-        # Apply maneuvers
-        for m_t, m_cmd, m_val in maneuvers:
-            if t > m_t:
-                fdm.set_property_value(m_cmd, m_val)
-        
-        fdm.run()
-        
-        # Calculate local position (simplified integration)
-        vt = fdm.get_property_value('velocities/v-true-fps')
-        psi = fdm.get_property_value('attitude/psi-rad')
-        theta = fdm.get_property_value('attitude/theta-rad')
-        
-        dt = 1.0/120.0
-        x += vt * np.cos(theta) * np.cos(psi) * dt
-        y += vt * np.cos(theta) * np.sin(psi) * dt
-        
-        data['t'].append(t)
-        data['x'].append(x)
-        data['y'].append(y)
-        data['z'].append(fdm.get_property_value('position/h-agl-ft'))
-        data['v'].append(fdm.get_property_value('velocities/vc-kts'))
-        data['pitch'].append(fdm.get_property_value('attitude/theta-deg'))
-        
+from sst.batch import run_batch
+from sst.build import BuildCache, outdated
+from sst.catalog import CATALOG, Catalog
+from sst.frames import FT, local_track
+from sst.guards import COMPLETED
+from sst.plotting import Layout, PlotJob, render, save_trajectory
+
+# Scenarios (IC, maneuvers) live in data/scenarios.json, group 'combat'
+GROUP = 'combat'
+
+def add_track(data):
+    # Local north/east position from the recorded lat/lon (ft)
+    track = local_track(data['lat'], data['lon'], data['h_sl'], unit=FT)
+    data['x'] = track[:, 0]
+    data['y'] = track[:, 1]
     return data
 
-def plot_and_save(data, title, filename):
-    fig = plt.figure(figsize=(12, 8))
-    ax = fig.add_subplot(111, projection='3d')
+LAYOUT = Layout(figsize=(12, 8), projection='3d')
+
+def draw_track(ax, data, title):
     ax.plot(data['x'], data['y'], data['z'], label=title, lw=2, color='blue')
     ax.set_title(title)
     ax.set_xlabel('X (ft)')
     ax.set_ylabel('Y (ft)')
     ax.set_zlabel('Altitude (ft)')
     ax.legend()
-    plt.savefig(filename)
-    plt.close()
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--catalog', default=CATALOG, help="scenario catalog (JSON)")
+    parser.add_argument('--no-plots', action='store_true', help="only save the trajectories (.npz)")
+    parser.add_argument('--force', action='store_true', help="rebuild even up-to-date outputs")
+    args = parser.parse_args(argv)
     os.makedirs('combat_trajectories', exist_ok=True)
-    
-    # 1. BVR: High Altitude Intercept (Straight, High Speed, Slight Climb)
-    print("Generating BVR Trajectory...")
-    bvr_maneuvers = [(2.0, 'fcs/elevator-cmd-norm', -0.05)]
-    bvr_data = run_simulation('BVR Intercept', 35000, 600, 1.0, bvr_maneuvers)
-    plot_and_save(bvr_data, 'BVR High-Altitude Intercept', 'combat_trajectories/bvr_intercept.png')
-    
-    # 2. WVR: Defensive Break (Hard Turn & Dive)
-    print("Generating WVR Defensive Break...")
-    wvr_maneuvers = [
-        (1.0, 'fcs/aileron-cmd-norm', 0.6),  # Roll
-        (2.0, 'fcs/elevator-cmd-norm', 0.8), # Pull hard (into dive since rolled)
-        (4.0, 'fcs/aileron-cmd-norm', 0.0)   # Stop roll
-    ]
-    wvr_data = run_simulation('WVR Defensive Break', 15000, 400, 1.0, wvr_maneuvers)
-    plot_and_save(wvr_data, 'WVR Defensive Break Turn', 'combat_trajectories/wvr_break.png')
 
-    # 3. WVR: High-Yoyo / Pitch back
-    print("Generating WVR Combat Turn...")
-    yoyo_maneuvers = [
-        (1.0, 'fcs/elevator-cmd-norm', -0.6), # Pitch up
-        (3.0, 'fcs/aileron-cmd-norm', 0.4),   # Bank
-    ]
-    yoyo_data = run_simulation('WVR Combat Maneuver', 10000, 450, 1.0, yoyo_maneuvers)
-    plot_and_save(yoyo_data, 'WVR Combat Maneuver (Climb & Bank)', 'combat_trajectories/wvr_maneuver.png')
+    # BVR intercept, WVR defensive break, high-yoyo
+    entries = Catalog(args.catalog).entries(GROUP)
+    # 스펙/기체/JSBSim 이 그대로인 궤적은 다시 돌리지 않는다
+    with BuildCache('combat_trajectories', force=args.force) as build:
+        todo = build.stale(entries)
+        print(f"Generating {len(todo)} combat trajectories ({len(entries) - len(todo)} up to date)...")
+        for entry, data in zip(todo, run_batch([entry.scenario for entry in todo])):
+            if data['termination'] != COMPLETED:
+                print(f"[{entry.key}] Warning: terminated early ({data['termination']})")
+            save_trajectory(build.output(entry.key), add_track(data))
+            build.done(entry.key)
+    plots = []
+    for entry in entries:
+        filename = f'combat_trajectories/{entry.key}.png'
+        source = filename.replace('.png', '.npz')
+        if outdated(filename, source):
+            plots.append(PlotJob(draw_track, source, filename, entry.title, LAYOUT))
+    render(plots, skip=args.no_plots)
 
     print("All combat trajectories generated in combat_trajectories/")
+
+if __name__ == "__main__":
+    main()
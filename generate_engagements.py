@@ -0,0 +1,72 @@
+import argparse
+import os
+from collections import Counter
+
+from sst.build import BuildCache, outdated
+from sst.catalog import CATALOG, Catalog
+from sst.engagement import run_engagements
+from sst.plotting import Layout, PlotJob, render, save_trajectory
+
+# Two-ship engagements from data/scenarios.json ('engagements'), stepped in
+# lockstep; one .npz per engagement with both tracks and the pair geometry
+
+OUT_DIR = 'engagement_trajectories'
+COLORS = ('blue', 'red', 'green', 'orange')
+
+LAYOUT = Layout(figsize=(12, 10), rows=2)
+
+def draw_engagement(axes, data, title):
+    track, geometry = axes
+    labels = [name[:-len('_north')] for name in data if name.endswith('_north')]
+    for label, color in zip(labels, COLORS):
+        track.plot(data[f'{label}_east'], data[f'{label}_north'], lw=2, color=color, label=label)
+        track.plot(data[f'{label}_east'][:1], data[f'{label}_north'][:1], 'o', color=color)
+    track.set_title(title)
+    track.set_xlabel('East (ft)')
+    track.set_ylabel('North (ft)')
+    track.set_aspect('equal', adjustable='datalim')
+    track.legend()
+
+    own, target = labels[0], labels[1]
+    geometry.plot(data['t'], data[f'{own}_{target}_range'], color='black', label='range (ft)')
+    geometry.set_xlabel('Time (s)')
+    geometry.set_ylabel('Range (ft)')
+    angles = geometry.twinx()
+    angles.plot(data['t'], data[f'{own}_{target}_ata'], color=COLORS[0], label='ATA')
+    angles.plot(data['t'], data[f'{own}_{target}_aspect'], color=COLORS[1], label='aspect')
+    angles.set_ylabel('Angle (deg)')
+    angles.legend(loc='upper right')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('names', nargs='*', help="engagements to run (default: all)")
+    parser.add_argument('--catalog', default=CATALOG, help="scenario catalog (JSON)")
+    parser.add_argument('--out', default=OUT_DIR, help="output directory")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--no-plots', action='store_true', help="only save the trajectories (.npz)")
+    parser.add_argument('--force', action='store_true', help="rebuild even up-to-date outputs")
+    args = parser.parse_args(argv)
+
+    catalog = Catalog(args.catalog)
+    entries = [catalog.engagement(name) for name in (args.names or catalog.engagements)]
+    os.makedirs(args.out, exist_ok=True)
+    reasons = Counter()
+    with BuildCache(args.out, force=args.force) as build:
+        todo = build.stale(entries)
+        print(f"Generating {len(todo)} engagements ({len(entries) - len(todo)} up to date)...")
+        for entry, data in zip(todo, run_engagements([entry.scenario for entry in todo], args.workers)):
+            reasons[str(data['termination'])] += 1
+            save_trajectory(build.output(entry.key), data)
+            build.done(entry.key)
+    plots = []
+    for entry in entries:
+        source = os.path.join(args.out, f"{entry.key}.npz")
+        if outdated(source.replace('.npz', '.png'), source):
+            plots.append(PlotJob(draw_engagement, source, source.replace('.npz', '.png'),
+                                 entry.title, LAYOUT, tight=True))
+    render(plots, skip=args.no_plots)
+    print(f"Saved {len(todo)} engagements in {args.out}/")
+    print("Termination: " + ", ".join(f"{reason}={n}" for reason, n in reasons.most_common()))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 import jsbsim
 import os
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
+from sst.frames import local_track
+
 def generate_working_trajectory():
     # 데이터 경로 설정
     jsbsim_path = os.path.dirname(jsbsim.__file__)
@@ -38,16 +38,15 @@ def generate_working_trajectory():
             
         fdm.run()
         
-        # NED 좌표계 또는 거리를 직접 계산
-        # JSBSim의 distance-from-start-lat/lon 속성 활용
-        x = fdm.get_property_value('position/distance-from-start-lat-ft') * 0.3048
-        y = fdm.get_property_value('position/distance-from-start-lon-ft') * 0.3048
-        z = fdm.get_property_value('position/h-sl-ft') * 0.3048
-        
-        positions.append([x, y, z])
+        # 위경도/고도를 모아 두고 루프가 끝난 뒤 NED 좌표로 한 번에 변환
+        positions.append([fdm.get_property_value('position/lat-geod-deg'),
+                          fdm.get_property_value('position/long-gc-deg'),
+                          fdm.get_property_value('position/h-sl-ft')])
 
-    pos_array = np.array(positions)
+    positions = np.array(positions)
+    pos_array = local_track(positions[:, 0], positions[:, 1], positions[:, 2])
     
+    import matplotlib.pyplot as plt  # 그림을 그릴 때만 로드
     # 3D 시각화
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_subplot(111, projection='3d')
@@ -1,9 +1,9 @@
 import jsbsim
 import os
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
+from sst.frames import local_track
+
 def generate_accurate_trajectory():
     fdm = jsbsim.FGFDMExec(os.path.dirname(jsbsim.__file__))
     
@@ -21,10 +21,6 @@ def generate_accurate_trajectory():
     
     fdm.set_dt(0.01) # 100Hz
     
-    # 초기 좌표 저장
-    start_lat = fdm.get_property_value('position/lat-geod-rad')
-    start_lon = fdm.get_property_value('position/long-gc-rad')
-    
     positions = []
     
     print("Simulating a High-G 360-degree Turn...")
@@ -41,19 +37,16 @@ def generate_accurate_trajectory():
             
         fdm.run()
         
-        # 현재 좌표 추출
-        curr_lat = fdm.get_property_value('position/lat-geod-rad')
-        curr_lon = fdm.get_property_value('position/long-gc-rad')
-        alt = fdm.get_property_value('position/h-sl-ft') * 0.3048
-        
-        # 라디안 차이를 미터로 변환 (대략적 계산)
-        x = (curr_lat - start_lat) * 6378137.0
-        y = (curr_lon - start_lon) * 6378137.0 * np.cos(start_lat)
-        
-        positions.append([x, y, alt])
+        # 현재 좌표 추출 (변환은 루프가 끝난 뒤 한 번에)
+        positions.append([fdm.get_property_value('position/lat-geod-deg'),
+                          fdm.get_property_value('position/long-gc-deg'),
+                          fdm.get_property_value('position/h-sl-ft')])
 
-    pos_array = np.array(positions)
+    # 위경도 차이를 WGS84 기준 NED 미터로 변환
+    positions = np.array(positions)
+    pos_array = local_track(positions[:, 0], positions[:, 1], positions[:, 2])
     
+    import matplotlib.pyplot as plt  # 그림을 그릴 때만 로드
     # 3D 그래프
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
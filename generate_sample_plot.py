@@ -1,9 +1,9 @@
 import jsbsim
 import os
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
+from sst.frames import local_track
+
 def generate_sample_trajectory():
     # JSBSim 실행 환경 설정
     fdm = jsbsim.FGFDMExec(os.path.dirname(jsbsim.__file__))
@@ -44,21 +44,15 @@ def generate_sample_trajectory():
             
         fdm.run()
         
-        # 위치 데이터 수집 (위도, 경도, 고도 기반으로 상대적 X, Y, Z 계산)
-        # 단순화를 위해 ft 단위를 m로 변환하여 상대 좌표로 시각화
-        x = fdm.get_property_value('position/distance-from-start-mag-ft') * 0.3048
-        alt = fdm.get_property_value('position/h-sl-ft') * 0.3048
-        psi = fdm.get_property_value('attitude/psi-deg')
-        
-        # 궤적 계산용 간단한 변환
-        positions.append([
-            x * np.cos(np.radians(psi)),
-            x * np.sin(np.radians(psi)),
-            alt
-        ])
+        # 위치 데이터 수집 (위도, 경도, 고도) - 상대 좌표 변환은 루프가 끝난 뒤 한 번에
+        positions.append([fdm.get_property_value('position/lat-geod-deg'),
+                          fdm.get_property_value('position/long-gc-deg'),
+                          fdm.get_property_value('position/h-sl-ft')])
 
-    pos_array = np.array(positions)
+    positions = np.array(positions)
+    pos_array = local_track(positions[:, 0], positions[:, 1], positions[:, 2])
     
+    import matplotlib.pyplot as plt  # 그림을 그릴 때만 로드
     # 3D 그래프 생성
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
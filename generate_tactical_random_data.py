@@ -1,100 +1,130 @@
-import jsbsim
-import os
-import matplotlib.pyplot as plt
-import numpy as np
-import random
+import argparse
 
-def generate_tactical_stable_data(duration_sec=60, dt=0.01):
-    jsbsim_path = os.path.dirname(jsbsim.__file__)
-    fdm = jsbsim.FGFDMExec(jsbsim_path)
-    
-    # F-16 모델 로드
-    fdm.load_model('f16')
-    
-    # 1. 초기 조건 설정 (IC)
-    fdm.set_property_value('ic/h-agl-ft', 20000.0)
-    fdm.set_property_value('ic/vc-kts', 450.0)
-    fdm.set_property_value('ic/theta-deg', 0.0) # 수평 피치
-    fdm.set_property_value('ic/alpha-deg', 2.0) # 살짝 받음각 부여
-    fdm.run_ic()
-    
-    # 2. 엔진 강제 기동 및 초기 안정화
-    fdm.set_property_value('propulsion/engine[0]/set-running', 1)
-    fdm.set_property_value('fcs/throttle-cmd-norm', 0.8) # 순항 추력
-    fdm.set_property_value('fcs/mixture-cmd-norm', 1.0)
-    
-    fdm.set_dt(dt)
-    
-    # 초기 안정화를 위해 5초간 그냥 흘려보냄 (Pre-run)
-    print("Stabilizing flight...")
-    for _ in range(int(5.0/dt)):
-        fdm.run()
+from sst.build import spec_digest
+from sst.dataset import DatasetWriter
+from sst.plotting import Layout, PlotJob, render, save_trajectory
+from sst.tactical import (ACTION, STATE, branch_meta, episode_meta, iter_branched_episodes,
+                          iter_episodes, run_episode)
 
-    steps = int(duration_sec / dt)
-    data = {
-        'time': [], 'alt': [], 'pitch': [], 'roll': [], 'vel': [], 'gload': [],
-        'elevator': [], 'aileron': []
-    }
-    
-    curr_el = 0.0
-    curr_ai = 0.0
-    target_el = 0.0
-    target_ai = 0.0
-    
-    print(f"Generating {duration_sec}s of Tactical Trajectory...")
-    
-    for i in range(steps):
-        t = i * dt
-        
-        # 전술적 랜덤 기동 (3초마다 변경)
-        if i % int(3.0/dt) == 0:
-            # BVR/WVR 상황을 모사하여 피치와 롤을 과감하게 사용
-            target_el = random.uniform(-0.5, 0.2) # -0.5는 꽤 강하게 당기는 기동
-            target_ai = random.uniform(-0.4, 0.4)
-            
-        # 조종 입력 평활화 (Smoothing)
-        curr_el += (target_el - curr_el) * 0.05
-        curr_ai += (target_ai - curr_ai) * 0.05
-        
-        fdm.set_property_value('fcs/elevator-cmd-norm', curr_el)
-        fdm.set_property_value('fcs/aileron-cmd-norm', curr_ai)
-        fdm.set_property_value('fcs/throttle-cmd-norm', 0.9)
-        
-        fdm.run()
-        
-        # 고도가 너무 낮아지면 강제로 기수 올리기 (Safety)
-        alt = fdm.get_property_value('position/h-agl-ft')
-        if alt < 5000:
-            target_el = -0.8 # Pull up!
-            
-        if i % 10 == 0: # 100Hz 데이터를 10Hz로 기록
-            data['time'].append(t)
-            data['alt'].append(alt)
-            data['pitch'].append(fdm.get_property_value('attitude/theta-deg'))
-            data['roll'].append(fdm.get_property_value('attitude/phi-deg'))
-            data['vel'].append(fdm.get_property_value('velocities/vc-kts'))
-            data['gload'].append(fdm.get_property_value('accelerations/n-pilot-z-norm'))
-            data['elevator'].append(curr_el)
-            data['aileron'].append(curr_ai)
+DATASET_DIR = 'tactical_dataset'
+LAYOUT = Layout(figsize=(12, 14), rows=4)
 
-    # 시각화
-    fig, axes = plt.subplots(4, 1, figsize=(12, 14))
+def draw_tactical(axes, data, title):
     axes[0].plot(data['time'], data['alt'], label='Altitude (ft)')
-    axes[0].set_title('Tactical Flight Data (Initialized & Stable)')
+    axes[0].set_title(title)
     
     axes[1].plot(data['time'], data['pitch'], label='Pitch (deg)', color='orange')
     axes[1].plot(data['time'], data['roll'], label='Roll (deg)', color='red', alpha=0.5)
     
     axes[2].plot(data['time'], data['vel'], label='Velocity (kts)', color='green')
-    axes[2].plot(data['time'], [v*10 for v in data['gload']], label='G-Load (x10)', color='purple', linestyle='--')
+    axes[2].plot(data['time'], data['gload']*10, label='G-Load (x10)', color='purple', linestyle='--')
     
     axes[3].plot(data['time'], data['elevator'], label='Elevator Input')
     axes[3].plot(data['time'], data['aileron'], label='Aileron Input', alpha=0.7)
     
     for ax in axes: ax.legend(); ax.grid(True)
-    plt.tight_layout()
-    plt.savefig('tactical_stable_trajectory.png')
-    print("Stable tactical data generated: 'tactical_stable_trajectory.png'")
+
+def generate_tactical_stable_data(seed=0, index=0, duration_sec=60, dt=0.01, store=None,
+                                  dataset_dir=DATASET_DIR, plot=True):
+    # 트림 포인트(20,000ft/450kt, 5초 안정화)에서 출발해 3초마다 랜덤 목표로 기동한다.
+    # 같은 (seed, index)는 언제 다시 돌려도 같은 에피소드를 만든다.
+    print(f"Generating {duration_sec}s of Tactical Trajectory (seed={seed}, episode={index})...")
+    data = run_episode(seed, index, duration_sec, dt, store)
+
+    # 수치 데이터는 학습용 데이터셋 샤드에 저장 (같은 digest 가 이미 있으면 다시 넣지 않는다)
+    if dataset_dir:
+        meta = episode_meta(seed, index, duration_sec, dt)
+        meta['digest'] = spec_digest(meta)
+        with DatasetWriter(dataset_dir, STATE, ACTION) as writer:
+            if meta['digest'] in writer.digests():
+                print(f"Episode {index} already in '{dataset_dir}'")
+            else:
+                writer.add(data, meta)
+
+    # 시각화는 저장된 궤적을 읽어서 별도 단계로 그린다
+    source = save_trajectory('tactical_stable_trajectory.npz', data)
+    job = PlotJob(draw_tactical, source, 'tactical_stable_trajectory.png',
+                  'Tactical Flight Data (Initialized & Stable)', LAYOUT, tight=True)
+    if render([job], skip=not plot):
+        print("Stable tactical data generated: 'tactical_stable_trajectory.png'")
+
+def generate_tactical_dataset(n_episodes, seed=0, workers=None, duration_sec=60, dt=0.01,
+                              dataset_dir=DATASET_DIR, start=0):
+    # 에피소드는 워커 수와 무관하게 인덱스 순서대로 기록된다.
+    # 이미 데이터셋에 있는 에피소드(같은 digest)는 건너뛰므로 중단된 빌드를 이어서 돈다.
+    with DatasetWriter(dataset_dir, STATE, ACTION) as writer:
+        built = writer.digests()
+        pending = {}
+        for index in range(start, start + n_episodes):
+            meta = episode_meta(seed, index, duration_sec, dt)
+            meta['digest'] = spec_digest(meta)
+            if meta['digest'] not in built:
+                pending[index] = meta
+        if len(pending) < n_episodes:
+            print(f"{n_episodes - len(pending)} episodes already in '{dataset_dir}'")
+        episodes = iter_episodes(seed, pending, duration_sec, dt, workers)
+        for count, (meta, data) in enumerate(zip(pending.values(), episodes), 1):
+            writer.add(data, meta)
+            if count % 100 == 0:
+                print(f"{count}/{len(pending)} episodes written")
+    print(f"{len(pending)} tactical episodes written to '{dataset_dir}'")
+
+def generate_branched_dataset(n_episodes, branches, decisions, horizon=None, seed=0, workers=None,
+                              duration_sec=60, dt=0.01, dataset_dir=DATASET_DIR, start=0):
+    # 에피소드마다 결정 시점(목표 변경)에서 갈라진 분기들을 먼저, 트렁크를 마지막에 기록한다.
+    # 트렁크가 데이터셋에 있으면 그 에피소드는 끝난 것이고, 중간에 끊긴 에피소드는
+    # 이미 기록된 분기(같은 digest)를 빼고 다시 채운다.
+    with DatasetWriter(dataset_dir, STATE, ACTION) as writer:
+        built = writer.digests()
+        pending = {}
+        for index in range(start, start + n_episodes):
+            meta = episode_meta(seed, index, duration_sec, dt)
+            meta.update(branches=branches, decisions=decisions, horizon=horizon)
+            meta['digest'] = spec_digest(meta)
+            if meta['digest'] not in built:
+                pending[index] = meta
+        if len(pending) < n_episodes:
+            print(f"{n_episodes - len(pending)} branched episodes already in '{dataset_dir}'")
+        episodes = iter_branched_episodes(seed, pending, branches, decisions, horizon,
+                                          duration_sec, dt, workers)
+        written = 0
+        for count, (meta, (trunk, taken)) in enumerate(zip(pending.values(), episodes), 1):
+            for time, branch, data in taken:
+                entry = branch_meta(meta, time, branch)
+                entry['digest'] = spec_digest(entry)
+                if entry['digest'] not in built:
+                    writer.add(data, entry)
+                    written += 1
+            writer.add(trunk, meta)
+            if count % 10 == 0:
+                print(f"{count}/{len(pending)} branched episodes written")
+    print(f"{len(pending)} tactical episodes and {written} branches written to '{dataset_dir}'")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seeded random tactical episodes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--episodes', type=int, default=1,
+                        help="more than one writes a dataset without plotting")
+    parser.add_argument('--start', type=int, default=0, help="index of the first episode")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--dataset', default=DATASET_DIR)
+    parser.add_argument('--no-plots', action='store_true', help="only save the trajectory (.npz)")
+    parser.add_argument('--branches', type=int, default=0,
+                        help="counterfactual continuations per decision point (writes a dataset)")
+    parser.add_argument('--decisions', type=int, default=6, help="decision points per episode")
+    parser.add_argument('--horizon', type=float, help="seconds each branch flies (default: to the end)")
+    args = parser.parse_args(argv)
+
+    if args.branches:
+        generate_branched_dataset(args.episodes, args.branches, args.decisions, args.horizon,
+                                  args.seed, args.workers, dataset_dir=args.dataset,
+                                  start=args.start)
+    elif args.episodes == 1:
+        generate_tactical_stable_data(args.seed, args.start, dataset_dir=args.dataset,
+                                      plot=not args.no_plots)
+    else:
+        generate_tactical_dataset(args.episodes, args.seed, args.workers,
+                                  dataset_dir=args.dataset, start=args.start)
 
 if __name__ == "__main__":
-    generate_tactical_stable_data()
+    main()
@@ -1,6 +1,5 @@
 import jsbsim
 import os
-import matplotlib.pyplot as plt
 
 def generate_flight_data():
     jsbsim_path = os.path.dirname(jsbsim.__file__)
@@ -50,6 +49,7 @@ def generate_flight_data():
         pitches.append(fdm.get_property_value('attitude/theta-deg'))
         lifts.append(fdm.get_property_value('forces/lift-lbs'))
 
+    import matplotlib.pyplot as plt  # 그림을 그릴 때만 로드
     # 그래프 생성
     fig = plt.figure(figsize=(15, 10))
     
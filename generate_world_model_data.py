@@ -1,77 +1,66 @@
-import jsbsim
+import argparse
 import os
-import matplotlib.pyplot as plt
 
-def generate_trajectory():
-    jsbsim_path = os.path.dirname(jsbsim.__file__)
-    fdm = jsbsim.FGFDMExec(jsbsim_path)
-    
-    # Cessna 172 모델 로드
-    fdm.load_model('c172x')
-    
-    # 초기 조건 설정 (순항 상태)
-    fdm.set_property_value('ic/h-agl-ft', 5000.0)
-    fdm.set_property_value('ic/vc-kts', 100.0)
-    fdm.run_ic()
-    
-    # 시뮬레이션 설정
-    dt = 0.1
-    fdm.set_dt(dt)
-    
-    # 데이터 저장을 위한 리스트
-    times = []
-    pitches = []
-    altitudes = []
-    velocities = []
-    
-    print("Generating 30s flight trajectory...")
-    
-    for i in range(300): # 30초 시뮬레이션
-        t = i * dt
-        
-        # 엔진 가동 및 스로틀 최대
-        fdm.set_property_value('fcs/throttle-cmd-norm', 1.0)
-        fdm.set_property_value('fcs/mixture-cmd-norm', 1.0)
-        fdm.set_property_value('propulsion/engine[0]/set-running', 1)
-        
-        # 5초~15초 사이에 엘리베이터를 서서히 당겨서 상승 시도
-        if 5.0 <= t < 15.0:
-            fdm.set_property_value('fcs/elevator-cmd-norm', -0.2)
-        elif 15.0 <= t < 25.0:
-            fdm.set_property_value('fcs/elevator-cmd-norm', 0.1) # 다시 기수 숙이기
-        else:
-            fdm.set_property_value('fcs/elevator-cmd-norm', 0.0)
-            
-        fdm.run()
-        
-        # 데이터 수집
-        times.append(t)
-        pitches.append(fdm.get_property_value('attitude/theta-deg'))
-        altitudes.append(fdm.get_property_value('position/h-agl-ft'))
-        velocities.append(fdm.get_property_value('velocities/vc-kts'))
+from sst.build import spec_digest
+from sst.catalog import CATALOG, Catalog
+from sst.dataset import DatasetWriter, scenario_meta
+from sst.plotting import Layout, PlotJob, render, save_trajectory
+from sst.rollout import run_scenario
 
-    # 결과 플롯 생성
-    plt.figure(figsize=(12, 8))
-    
-    plt.subplot(3, 1, 1)
-    plt.plot(times, altitudes, label='Altitude (ft)')
-    plt.ylabel('Altitude')
-    plt.legend()
-    
-    plt.subplot(3, 1, 2)
-    plt.plot(times, pitches, label='Pitch (deg)', color='orange')
-    plt.ylabel('Pitch')
-    plt.legend()
-    
-    plt.subplot(3, 1, 3)
-    plt.plot(times, velocities, label='Velocity (kts)', color='green')
-    plt.xlabel('Time (s)')
-    plt.ylabel('Velocity')
-    plt.legend()
-    
-    plt.tight_layout()
-    plt.savefig('world_model_trajectory.png')
-    print("Trajectory data generated and saved to 'world_model_trajectory.png'")
+DATASET_DIR = 'world_model_dataset'
+# Cessna 172 순항 (5,000ft, 100kts): 물리 120Hz, 제어/기록 10Hz
+# -> data/scenarios.json 의 'world_model' 그룹
+GROUP = 'world_model'
+STATE = ['alt', 'pitch', 'vel']
+ACTION = ['elevator', 'throttle']
+LAYOUT = Layout(figsize=(12, 8), rows=3)
+
+def draw_world_model(axes, data, title):
+    times = data['t']
+    axes[0].plot(times, data['alt'], label='Altitude (ft)')
+    axes[0].set_ylabel('Altitude')
+
+    axes[1].plot(times, data['pitch'], label='Pitch (deg)', color='orange')
+    axes[1].set_ylabel('Pitch')
+
+    axes[2].plot(times, data['vel'], label='Velocity (kts)', color='green')
+    axes[2].set_xlabel('Time (s)')
+    axes[2].set_ylabel('Velocity')
+
+    for ax in axes: ax.legend()
+
+def generate_trajectory(dataset_dir=DATASET_DIR, plot=True, catalog=CATALOG):
+    scenario = Catalog(catalog).scenarios(GROUP)[0]
+    meta = scenario_meta(scenario, digest=spec_digest(scenario))
+    writer = DatasetWriter(dataset_dir, STATE, ACTION) if dataset_dir else None
+    stored = writer is not None and meta['digest'] in writer.digests()
+    if stored and not (plot and not os.path.exists('world_model_trajectory.png')):
+        writer.close()
+        print(f"Trajectory already in '{dataset_dir}'")
+        return
+    print(f"Generating {scenario.duration:g}s flight trajectory...")
+    # 5초~15초 사이에 엘리베이터를 당겨서 상승, 15초~25초 다시 기수 숙이기
+    data = run_scenario(scenario)
+
+    # 수치 데이터는 학습용 데이터셋 샤드에 저장
+    if writer is not None:
+        with writer:
+            if not stored:
+                writer.add(data, meta)
+
+    # 시각화는 저장된 궤적을 읽어서 별도 단계로 그린다
+    source = save_trajectory('world_model_trajectory.npz', data)
+    job = PlotJob(draw_world_model, source, 'world_model_trajectory.png', layout=LAYOUT, tight=True)
+    if render([job], skip=not plot):
+        print("Trajectory data generated and saved to 'world_model_trajectory.png'")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dataset', default=DATASET_DIR)
+    parser.add_argument('--catalog', default=CATALOG, help="scenario catalog (JSON)")
+    parser.add_argument('--no-plots', action='store_true', help="only save the trajectory (.npz)")
+    args = parser.parse_args(argv)
+    generate_trajectory(args.dataset, plot=not args.no_plots, catalog=args.catalog)
 
 if __name__ == "__main__":
-    generate_trajectory()
+    main()
@@ -1,6 +1,10 @@
 import jsbsim
+import numpy as np
 import os
 
+from sst.observation import schema_from_spec
+from sst.properties import PropertyCache
+
 def inspect_physics():
     jsbsim_path = os.path.dirname(jsbsim.__file__)
     fdm = jsbsim.FGFDMExec(jsbsim_path)
@@ -20,37 +24,27 @@ def inspect_physics():
     
     fdm.run_ic()
     
-    # JSBSim 기본 정보 및 물리 변수 리스트
-    properties = {
-        "Initial Speed (kts)": "velocities/vc-kts",
-        "Mass (slugs)": "inertia/mass-slugs",
-        "Weight (lbs)": "inertia/weight-lbs",
-        "Wing Area (sqft)": "metrics/sw-sqft",
-        "Timestep (sec)": "simulation/dt",
-        "Gravity (ft/s^2)": "accelerations/g-acceleration-ft_sec2",
-        "Alpha (AoA deg)": "aero/alpha-deg",
-        "Beta (deg)": "aero/beta-deg",
-        "Pitch (deg)": "attitude/theta-deg",
-        "Roll (deg)": "attitude/phi-deg",
-        "Elevator Pos (deg)": "fcs/elevator-pos-deg",
-        "Thrust (lbs)": "propulsion/engine[0]/thrust-lbs",
-        "Lift Force (lbs)": "forces/lift-lbs",
-        "Drag Force (lbs)": "forces/drag-lbs",
-        "Side Force (lbs)": "forces/side-lbs",
-        "Gravity Force Body-Z (lbs)": "forces/fbz-gravity-lbs",
-        "Aero Force Body-Z (lbs)": "forces/fbz-aero-lbs",
-    }
+    # JSBSim 기본 정보 및 물리 변수 (sst.observation 프리셋, 한 번에 읽고 SI 로 한 번에 변환)
+    schema = schema_from_spec({
+        'vel': True, 'mass': True, 'weight': True, 'wing_area': True,
+        'dt': {'path': 'simulation/dt', 'source': 'sec'},
+        'gravity': True, 'alpha': True, 'beta': True, 'pitch': True, 'roll': True,
+        'elevator_pos': True, 'thrust': True, 'lift': True, 'drag': True, 'side': True,
+        'fbz_gravity': True, 'fbz_aero': True,
+    })
+    si = schema.si()
+    raw = np.array(schema.reader(PropertyCache(fdm)).read())[:, None]
+    values = schema.columns(raw)
+    si_values = si.columns(raw)
 
     print("\n" + "="*50)
     print("JSBSim Physical Environment & Model Inspection")
     print("="*50)
     
-    for label, prop in properties.items():
-        try:
-            val = fdm.get_property_value(prop)
-            print(f"{label:<25}: {val:>10.4f}")
-        except:
-            print(f"{label:<25}: [Property Not Found]")
+    for c, s in zip(schema.channels, si.channels):
+        label = f"{c.name} ({c.delivered_unit or '-'})"
+        print(f"{label:<25}: {values[c.name][0]:>12.4f}   "
+              f"{si_values[c.name][0]:>14.4f} {s.delivered_unit or ''}")
 
     # 좌표계 확인 (NED 기준)
     print("\n--- Coordinate System Check (Local Frame) ---")
@@ -0,0 +1,5 @@
+"""Silver-Shadow Tactical flight simulation pipeline (JSBSim based).
+
+Submodules are imported on demand so that light-weight tools do not pay
+for JSBSim/NumPy start-up they never use.
+"""
@@ -0,0 +1,3 @@
+from sst.cli import main
+
+main()
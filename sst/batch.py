@@ -0,0 +1,66 @@
+"""Fan scenario rollouts out over a process pool.
+
+Each worker keeps its own snapshot store (and with it an FDM pool), so the
+aircraft model is loaded once per worker and trim points are settled once
+per worker rather than once per scenario.
+"""
+import os
+from itertools import islice
+
+from sst import timing
+from sst.rollout import run_scenario
+from sst.snapshot import SnapshotStore, default_store
+
+_worker_store = None
+
+
+def _init_worker(store_path):
+    global _worker_store
+    _worker_store = SnapshotStore(store_path, readonly=True)
+
+
+def _run_in_worker(job):
+    fn, item = job
+    # 프로파일은 결과와 함께 부모 프로세스로 보낸다
+    return fn(item, _worker_store), timing.drain()
+
+
+def iter_batch(fn, items, workers=None, chunksize=1, store_path=None, window=None):
+    """Yield ``fn(item, store)`` for every item, in order.
+
+    ``fn`` must be a module-level function so it can be sent to the
+    workers.  Items are submitted ``window`` at a time (default: four
+    chunks per worker), so arbitrarily long item iterators run in bounded
+    memory and results can be consumed as they arrive.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = iter(items)
+    if workers == 1:
+        store = SnapshotStore(store_path) if store_path else default_store()
+        for item in items:
+            yield fn(item, store)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    window = window or workers * chunksize * 4
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(store_path,)) as pool:
+        while True:
+            block = [(fn, item) for item in islice(items, window)]
+            if not block:
+                break
+            for result, profiles in pool.map(_run_in_worker, block, chunksize=chunksize):
+                timing.collect(profiles)
+                yield result
+
+
+def run_batch(scenarios, workers=None, chunksize=1, store_path=None):
+    """Run ``scenarios`` and return their results in the same order.
+
+    ``workers=1`` runs in-process, which is handy for debugging and for
+    ``logic`` callbacks that cannot be pickled.  ``store_path`` points the
+    workers at a shared, pre-computed snapshot file; they only read it.
+    """
+    scenarios = list(scenarios)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(scenarios)) or 1
+    return list(iter_batch(run_scenario, scenarios, workers, chunksize, store_path))
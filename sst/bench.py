@@ -0,0 +1,308 @@
+"""Throughput benchmarks for the simulation pipeline.
+
+Every ``bench_*`` function returns a plain dict of numbers so the whole
+suite can be dumped as JSON and compared across commits.  Times are wall
+clock (``time.perf_counter``); repeated measurements report the median.
+"""
+import os
+import platform
+import statistics
+import time
+
+import jsbsim
+import numpy as np
+
+from sst.batch import run_batch
+from sst.catalog import Catalog
+from sst.core import AIRCRAFT, create_fdm, default_pool
+from sst.guards import ENVELOPE, GuardMonitor, envelope
+from sst.output import NativeOutput, load_output
+from sst.recorder import TrajectoryRecorder
+from sst.rollout import Scenario, run_scenario
+from sst.snapshot import SnapshotStore
+from sst.tactical import run_episode
+
+DTS = (1.0/120.0, 0.01)
+
+# 기종별 벤치마크 초기 조건 (순항)
+BENCH_IC = {
+    'f16': {'ic/h-agl-ft': 20000.0, 'ic/vc-kts': 450.0},
+    'c172x': {'ic/h-agl-ft': 5000.0, 'ic/vc-kts': 100.0},
+}
+
+# 시나리오 생성기의 루프가 매 스텝 읽고 쓰는 속성들
+HOT_READS = [
+    'simulation/sim-time-sec',
+    'velocities/vt-fps',
+    'attitude/psi-rad',
+    'attitude/theta-rad',
+    'position/h-agl-ft',
+    'velocities/vc-kts',
+    'attitude/theta-deg',
+]
+HOT_WRITES = [
+    ('fcs/elevator-cmd-norm', -0.06),
+    ('fcs/aileron-cmd-norm', 0.0),
+    ('fcs/throttle-cmd-norm', 0.9),
+]
+
+
+def _median_time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def environment():
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'jsbsim': jsbsim.__version__,
+        'numpy': np.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def bench_model_load(aircraft=AIRCRAFT, repeat=5):
+    """Seconds to construct an executor and load each model."""
+    return {name: _median_time(lambda: create_fdm(name), repeat) for name in aircraft}
+
+
+def bench_run_ic(aircraft=AIRCRAFT, repeat=20):
+    """Seconds for ``run_ic`` on a loaded model vs. a pooled reset."""
+    pool = default_pool()
+    out = {}
+    for name in aircraft:
+        fdm = create_fdm(name)
+        for path, value in BENCH_IC[name].items():
+            fdm.set_property_value(path, value)
+        run_ic = _median_time(fdm.run_ic, repeat)
+        with pool.borrow(name, BENCH_IC[name]):
+            pass
+        pool_reset = _median_time(lambda: pool.release(pool.acquire(name, BENCH_IC[name])), repeat)
+        out[name] = {'run_ic_s': run_ic, 'pool_reset_s': pool_reset}
+    return out
+
+
+def bench_steps(aircraft=AIRCRAFT, dts=DTS, steps=10000):
+    """Bare ``fdm.run()`` throughput per aircraft and time step."""
+    pool = default_pool()
+    out = {}
+    for name in aircraft:
+        for dt in dts:
+            with pool.borrow(name, BENCH_IC[name], dt=dt) as fdm:
+                run = fdm.run
+                start = time.perf_counter()
+                for _ in range(steps):
+                    run()
+                elapsed = time.perf_counter() - start
+            out[f'{name}@{dt:.6g}'] = {
+                'dt': dt,
+                'steps_per_s': steps / elapsed,
+                'us_per_step': elapsed / steps * 1e6,
+                'realtime_factor': steps * dt / elapsed,
+                'hour_sim_s': 3600.0 / dt * elapsed / steps,
+            }
+    return out
+
+
+def _time_loop(fdm, step, steps):
+    start = time.perf_counter()
+    for i in range(steps):
+        step(fdm, i)
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def bench_property_access(aircraft='f16', steps=10000):
+    """Per-step cost (us) of the hot reads/writes via strings vs. handles."""
+    pool = default_pool()
+    ic = BENCH_IC[aircraft]
+
+    def bare(fdm, i):
+        fdm.run()
+
+    def by_string(fdm, i):
+        for path, value in HOT_WRITES:
+            fdm.set_property_value(path, value)
+        fdm.run()
+        for path in HOT_READS:
+            fdm.get_property_value(path)
+
+    def by_handle(props):
+        # 핸들은 시간을 재는 바로 그 실행기에서 얻어야 한다
+        setters = [(props.setter(path), value) for path, value in HOT_WRITES]
+        read = props.reader(HOT_READS).read
+
+        def step(fdm, i):
+            for set_value, value in setters:
+                set_value(value)
+            fdm.run()
+            read()
+        return step
+
+    variants = (('run_us', lambda props: bare), ('string_us', lambda props: by_string),
+                ('handle_us', by_handle))
+    out = {}
+    for label, make_step in variants:
+        with pool.borrow(aircraft, ic, dt=1.0/120.0) as fdm:
+            out[label] = _time_loop(fdm, make_step(pool.properties(fdm)), steps)
+    accesses = len(HOT_READS) + len(HOT_WRITES)
+    out['accesses_per_step'] = accesses
+    out['string_us_per_access'] = (out['string_us'] - out['run_us']) / accesses
+    out['handle_us_per_access'] = (out['handle_us'] - out['run_us']) / accesses
+    return out
+
+
+def bench_recorder(aircraft='f16', steps=10000, decimation=(1, 10)):
+    """Per-step cost (us) of recording the hot channels, from Python and natively."""
+    pool = default_pool()
+    ic = BENCH_IC[aircraft]
+    out = {}
+    with pool.borrow(aircraft, ic, dt=1.0/120.0) as fdm:
+        out['run_us'] = _time_loop(fdm, lambda fdm, i: fdm.run(), steps)
+    for d in decimation:
+        with pool.borrow(aircraft, ic, dt=1.0/120.0) as fdm:
+            reader = pool.properties(fdm).reader(HOT_READS)
+            recorder = TrajectoryRecorder(HOT_READS, steps, decimation=d)
+
+            def record(fdm, i):
+                fdm.run()
+                if i % d == 0:
+                    reader.read_into(recorder.slot())
+            out[f'record_d{d}_us'] = _time_loop(fdm, record, steps)
+        out[f'overhead_d{d}_us'] = out[f'record_d{d}_us'] - out['run_us']
+        # 같은 채널을 JSBSim 출력 지시문으로 기록하고 끝에 한 번에 읽는다
+        output = NativeOutput(tuple(HOT_READS), d)
+        with pool.borrow(aircraft, ic, dt=1.0/120.0, output=output) as fdm:
+            start = time.perf_counter()
+            for _ in range(steps):
+                fdm.run()
+            load_output(pool.output_path(fdm), len(HOT_READS))
+            out[f'native_d{d}_us'] = (time.perf_counter() - start) / steps * 1e6
+        out[f'overhead_native_d{d}_us'] = out[f'native_d{d}_us'] - out['run_us']
+    return out
+
+
+def bench_guards(aircraft='f16', steps=10000, every=(1, 10)):
+    """Per-step cost (us) of checking the envelope guards every ``every`` steps."""
+    pool = default_pool()
+    ic = BENCH_IC[aircraft]
+    out = {'guards': len(ENVELOPE)}
+    with pool.borrow(aircraft, ic, dt=1.0/120.0) as fdm:
+        out['run_us'] = _time_loop(fdm, lambda fdm, i: fdm.run(), steps)
+    for k in every:
+        with pool.borrow(aircraft, ic, dt=1.0/120.0) as fdm:
+            check = GuardMonitor(envelope(), pool.properties(fdm)).check
+
+            def guarded(fdm, i):
+                fdm.run()
+                if not i % k:
+                    check()
+            out[f'guarded_e{k}_us'] = _time_loop(fdm, guarded, steps)
+        out[f'overhead_e{k}_us'] = out[f'guarded_e{k}_us'] - out['run_us']
+    return out
+
+
+def generator_scenarios():
+    """One representative catalog scenario per scenario-based generator script."""
+    catalog = Catalog()
+    return {
+        'combat': catalog.entry('combat', 'wvr_break').scenario,
+        'tactical': catalog.entry('tactical', 'immelmann').scenario,
+        'validate': catalog.entry('validate', 'Loop').scenario,
+        'revalidate': catalog.entry('revalidate', 'Sustained_Turn').scenario,
+        'world_model': catalog.scenarios('world_model')[0],
+    }
+
+
+def generator_runs():
+    """``{name: (run(store), physics steps)}`` for every generator script."""
+    runs = {name: (lambda store, s=scenario: run_scenario(s, store),
+                   int(round(scenario.duration / scenario.dt)))
+            for name, scenario in generator_scenarios().items()}
+    # generate_tactical_random_data 의 기본 에피소드 (60 s, dt 0.01)
+    runs['tactical_random'] = (lambda store: run_episode(0, 0, 60, 0.01, store),
+                               int(60 / 0.01))
+    return runs
+
+
+def bench_generators(repeat=3):
+    """Seconds per scenario for each generator, with a fresh and a warm trim store.
+
+    ``cold_store_s`` only starts the trim/snapshot store over; the process's
+    executor pool and loaded models stay warm, so it is not a cold start.
+    """
+    out = {}
+    for name, (run, steps) in generator_runs().items():
+        cold = _median_time(lambda: run(SnapshotStore()), repeat)
+        store = SnapshotStore()
+        run(store)
+        warm = _median_time(lambda: run(store), repeat)
+        out[name] = {'cold_store_s': cold, 'warm_s': warm, 'steps': steps,
+                     'steps_per_s': steps / warm}
+    return out
+
+
+def bench_scaling(max_workers=None, scenarios=16, duration=10.0):
+    """Batch throughput for 1..``max_workers`` worker processes."""
+    max_workers = max_workers or os.cpu_count() or 1
+    batch = [Scenario(f'scale-{i}', 15000 + 100 * i, 400, throttle=1.0, duration=duration,
+                      maneuvers=[(1.0, 'fcs/elevator-cmd-norm', -0.2)])
+             for i in range(scenarios)]
+    out = {}
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        run_batch(batch, workers=workers)
+        elapsed = time.perf_counter() - start
+        out[workers] = {'elapsed_s': elapsed, 'scenarios_per_s': scenarios / elapsed}
+    base = out[1]['scenarios_per_s']
+    for workers, entry in out.items():
+        entry['speedup'] = entry['scenarios_per_s'] / base
+        entry['efficiency'] = entry['speedup'] / workers
+    return out
+
+
+def bench_vecenv(max_workers=None, num_envs=32, steps=100):
+    """``VecEnv`` throughput for 1..``max_workers`` worker processes."""
+    from sst.vecenv import VecEnv
+    max_workers = max_workers or os.cpu_count() or 1
+    actions = np.zeros((num_envs, 4))
+    actions[:, 3] = 0.9
+    out = {}
+    for workers in range(1, max_workers + 1):
+        with VecEnv(num_envs, workers=workers) as env:
+            env.reset()
+            start = time.perf_counter()
+            for _ in range(steps):
+                env.step(actions)
+            elapsed = time.perf_counter() - start
+        out[workers] = {'env_steps_per_s': steps / elapsed,
+                        'physics_steps_per_s': steps * num_envs * env.frame_skip / elapsed}
+    return out
+
+
+SUITE = {
+    'model_load': bench_model_load,
+    'run_ic': bench_run_ic,
+    'steps': bench_steps,
+    'property_access': bench_property_access,
+    'recorder': bench_recorder,
+    'guards': bench_guards,
+    'generators': bench_generators,
+    'scaling': bench_scaling,
+    'vecenv': bench_vecenv,
+}
+
+
+def run_suite(only=None, **options):
+    """Run the selected benchmarks; ``options`` maps a name to its kwargs."""
+    results = {'environment': environment()}
+    for name, bench in SUITE.items():
+        if only and name not in only:
+            continue
+        results[name] = bench(**options.get(name, {}))
+    return results
@@ -0,0 +1,158 @@
+"""Content-addressed skipping of up-to-date generator outputs.
+
+Every output is tagged with a digest of what produced it: the scenario
+spec (canonical JSON of the ``Scenario``/``Engagement`` or metadata
+dict), the aircraft model files, the baseline IC and the JSBSim version.
+``BUILD_VERSION`` is bumped by hand when a change to the rollout code
+itself changes results.
+
+``BuildCache`` keeps ``{output key: digest}`` in ``<root>/.build.json``.
+A generator asks it which entries are ``stale`` (digest changed or an
+output file missing), simulates only those, marks each one ``done`` once
+its files are written, and re-renders a PNG only if it is ``outdated``
+against its ``.npz``.  The manifest is saved every ``save_every`` marks,
+so an interrupted build loses at most that many finished rollouts.
+
+Datasets carry the digest in each episode's meta instead
+(``DatasetWriter.digests``); only episodes of written shards are in the
+index, so a build resumes after the last complete shard.
+"""
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+BUILD_VERSION = 1
+MANIFEST = '.build.json'
+
+
+def _plain(value):
+    """JSON-ready form of a spec: dataclasses to dicts, callables by name and source."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _plain(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if callable(value):
+        try:
+            source = inspect.getsource(value)
+        except (OSError, TypeError):
+            source = repr(value)
+        return {'callable': f'{value.__module__}.{value.__qualname__}',
+                'source': hashlib.sha256(source.encode()).hexdigest()}
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def canonical(spec):
+    return json.dumps(_plain(spec), sort_keys=True, separators=(',', ':'))
+
+
+def _aircraft_of(spec):
+    participants = getattr(spec, 'participants', None)
+    if participants:
+        return sorted({s.aircraft for s in participants.values()})
+    aircraft = spec.get('aircraft') if isinstance(spec, dict) else getattr(spec, 'aircraft', None)
+    return [aircraft] if aircraft else []
+
+
+def _hash_tree(h, root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            h.update(os.path.relpath(path, root).encode())
+            with open(path, 'rb') as f:
+                h.update(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def model_fingerprint(aircraft):
+    """Digest of JSBSim's version and every file that shapes ``aircraft``'s flight."""
+    import jsbsim
+    from sst.core import BASELINE_IC_FILE, JSBSIM_ROOT
+
+    h = hashlib.sha256()
+    h.update(f'{BUILD_VERSION}|{jsbsim.__version__}|{aircraft}'.encode())
+    with open(BASELINE_IC_FILE, 'rb') as f:
+        h.update(f.read())
+    # 엔진/시스템 파일은 기체 간에 공유되므로 통째로 넣는다
+    for sub in (os.path.join('aircraft', aircraft), 'engine', 'systems'):
+        _hash_tree(h, os.path.join(JSBSIM_ROOT, sub))
+    return h.hexdigest()
+
+
+def spec_digest(spec):
+    """Content hash of ``spec`` together with its aircraft models and JSBSim."""
+    h = hashlib.sha256(canonical(spec).encode())
+    for aircraft in _aircraft_of(spec):
+        h.update(model_fingerprint(aircraft).encode())
+    return h.hexdigest()[:32]
+
+
+def outdated(target, *sources):
+    """``True`` if ``target`` is missing or older than any of ``sources``."""
+    if not os.path.exists(target):
+        return True
+    mtime = os.path.getmtime(target)
+    return any(os.path.getmtime(s) > mtime for s in sources if os.path.exists(s))
+
+
+class BuildCache:
+    """Digests of the outputs already built under ``root``.
+
+    ``outputs`` are the files each entry writes, as ``str.format``
+    templates over its ``key``; ``force`` treats everything as stale.
+    """
+
+    def __init__(self, root, outputs=('{key}.npz',), force=False, save_every=100):
+        self.root = root
+        self.outputs = tuple(outputs)
+        self.force = force
+        self.save_every = save_every
+        self.path = os.path.join(root, MANIFEST)
+        self.built = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.built = json.load(f)
+        self._digests = {}
+        self._unsaved = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+
+    def output(self, key, template=None):
+        return os.path.join(self.root, (template or self.outputs[0]).format(key=key))
+
+    def fresh(self, key, spec):
+        digest = self._digests[key] = spec_digest(spec)
+        return (not self.force and self.built.get(key) == digest
+                and all(os.path.exists(self.output(key, t)) for t in self.outputs))
+
+    def stale(self, entries):
+        """The ``CatalogEntry`` items whose outputs have to be (re)built."""
+        return [entry for entry in entries if not self.fresh(entry.key, entry.scenario)]
+
+    def done(self, key):
+        """Record that ``key``'s outputs now match the digest seen by ``stale``."""
+        self.built[key] = self._digests[key]
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        if not self._unsaved:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.built, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._unsaved = 0
@@ -0,0 +1,140 @@
+"""Declarative scenario catalog (``data/scenarios.json``).
+
+The catalog has three sections:
+
+``profiles``
+    Shared rollout settings: any ``Scenario`` field, plus ``rate_hz``
+    (instead of ``dt``), ``warmup_steps`` (warmup in steps of ``dt``) and
+    ``commands`` that are prepended to every maneuver flown with it.
+    ``guards`` take the ``sst.guards.guards_from_spec`` form.
+``maneuvers``
+    A ``title``, an ``initial`` ``{property: value}`` dict applied from the
+    first step, and ``commands``: ``[t, property, value]`` entries that
+    take effect once the sim time passes ``t`` (see ``Scenario``).
+``groups``
+    Named lists of rollouts.  Each entry names a ``profile`` and a
+    ``maneuver`` and may override any ``Scenario`` field.  An entry with a
+    ``grid`` of ``{field: [values]}`` expands to the cartesian product of
+    the values, in key order; its ``key`` is a ``str.format`` template over
+    the entry's fields, e.g. ``"{maneuver}_{altitude_ft}ft"``.
+
+``engagements``
+    Named multi-aircraft runs (see ``sst.engagement``): ``title``,
+    ``duration``, ``record_hz``, optional ``pairs`` and ``participants``,
+    a ``{label: entry}`` mapping whose entries are built like group
+    entries.
+
+``Catalog(path).scenarios(group)`` gives the flat list that ``run_batch``
+or ``iter_batch`` schedule directly.
+"""
+import itertools
+import json
+import os
+from dataclasses import dataclass, fields
+
+from sst.engagement import Engagement
+from sst.guards import guards_from_spec
+from sst.rollout import Scenario
+
+CATALOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'data', 'scenarios.json')
+
+_SCENARIO_FIELDS = {f.name for f in fields(Scenario)} - {'name', 'maneuvers'}
+_FLOAT_FIELDS = ('altitude_ft', 'speed_kts', 'throttle', 'duration', 'dt', 'warmup',
+                 'control_hz', 'record_hz')
+_ENTRY_ONLY = {'key', 'name', 'title', 'profile', 'maneuver', 'grid'}
+
+
+@dataclass
+class CatalogEntry:
+    """One expanded rollout: ``key`` names its output files."""
+    key: str
+    title: str
+    scenario: Scenario
+
+
+def expand_grid(entry):
+    """Cartesian product of ``entry['grid']``; entries without a grid pass through."""
+    grid = entry.get('grid')
+    if not grid:
+        return [dict(entry)]
+    base = {k: v for k, v in entry.items() if k != 'grid'}
+    names = list(grid)
+    return [{**base, **dict(zip(names, values))}
+            for values in itertools.product(*(grid[n] for n in names))]
+
+
+class Catalog:
+    def __init__(self, path=CATALOG):
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+        self.profiles = spec.get('profiles', {})
+        self.maneuvers = spec.get('maneuvers', {})
+        self.groups = spec.get('groups', {})
+        self.engagements = spec.get('engagements', {})
+
+    def entries(self, group):
+        """All rollouts of ``group`` as ``CatalogEntry`` objects, grids expanded."""
+        if group not in self.groups:
+            raise KeyError(f"unknown scenario group '{group}' in {self.path}")
+        return [self.build(values) for entry in self.groups[group]
+                for values in expand_grid(entry)]
+
+    def scenarios(self, group):
+        return [entry.scenario for entry in self.entries(group)]
+
+    def entry(self, group, key):
+        for entry in self.entries(group):
+            if entry.key == key:
+                return entry
+        raise KeyError(f"no '{key}' in scenario group '{group}'")
+
+    def engagement(self, name):
+        """``CatalogEntry`` whose ``scenario`` is the ``Engagement`` called ``name``."""
+        if name not in self.engagements:
+            raise KeyError(f"unknown engagement '{name}' in {self.path}")
+        spec = self.engagements[name]
+        participants = {label: self.build({'name': f'{name}/{label}', **values}).scenario
+                        for label, values in spec['participants'].items()}
+        pairs = spec.get('pairs')
+        engagement = Engagement(name, participants, float(spec.get('duration', Engagement.duration)),
+                                float(spec.get('record_hz', Engagement.record_hz)),
+                                tuple(map(tuple, pairs)) if pairs else None)
+        return CatalogEntry(name, spec.get('title', name), engagement)
+
+    def build(self, values):
+        """``CatalogEntry`` for one (already expanded) group entry."""
+        unknown = set(values) - _SCENARIO_FIELDS - _ENTRY_ONLY
+        if unknown:
+            raise ValueError(f"unknown scenario fields: {sorted(unknown)}")
+        profile = dict(self.profiles[values['profile']]) if 'profile' in values else {}
+        maneuver = self.maneuvers[values['maneuver']] if 'maneuver' in values else {}
+
+        rate = profile.pop('rate_hz', None)
+        if rate:
+            profile['dt'] = 1.0 / rate
+        warmup_steps = profile.pop('warmup_steps', None)
+        commands = [tuple(c) for c in profile.pop('commands', ())]
+        kwargs = {**profile, **{k: v for k, v in values.items() if k in _SCENARIO_FIELDS}}
+        if warmup_steps is not None and 'warmup' not in values:
+            kwargs['warmup'] = warmup_steps * kwargs.get('dt', Scenario.dt)
+        for name in _FLOAT_FIELDS:
+            if kwargs.get(name) is not None:
+                kwargs[name] = float(kwargs[name])
+        if kwargs.get('floor'):
+            kwargs['floor'] = tuple(kwargs['floor'])
+        kwargs['ic'] = dict(kwargs.get('ic', {}))
+        if 'guards' in kwargs:
+            kwargs['guards'] = tuple(guards_from_spec(kwargs['guards']))
+
+        # initial 명령은 첫 스텝부터 적용된다
+        initial = [(float('-inf'), path, value)
+                   for path, value in maneuver.get('initial', {}).items()]
+        commands += initial + [tuple(c) for c in maneuver.get('commands', ())]
+
+        key = values.get('key') or values.get('maneuver') or values.get('name')
+        key = key.format(**values)
+        title = values.get('title') or maneuver.get('title') or key
+        scenario = Scenario(values.get('name') or key, maneuvers=commands, **kwargs)
+        return CatalogEntry(key, title.format(**values), scenario)
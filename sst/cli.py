@@ -0,0 +1,112 @@
+"""Single entry point for the generator scripts: ``python -m sst <command>``.
+
+Only the standard library is imported up front; each command imports its
+script (and with it NumPy/JSBSim/matplotlib) when it runs.  Generators run
+headless unless ``--plots`` is given, and ``--import-times`` prints how
+long each import phase took.  ``--profile out.json`` (or ``out.folded``)
+times the rollout loops (see ``sst.timing``) and writes the histograms.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+_T0 = time.perf_counter()
+
+# generator -> script module; each has main(argv) and a --no-plots flag
+GENERATORS = {
+    'combat': 'generate_combat_scenarios',
+    'tactical': 'generate_tactical_scenarios',
+    'validate': 'validate_maneuvers',
+    'revalidate': 'revalidate_maneuvers',
+    'random': 'generate_tactical_random_data',
+    'world-model': 'generate_world_model_data',
+    'catalog': 'generate_catalog_scenarios',
+    'engagement': 'generate_engagements',
+}
+# command -> (script module, entry function, heavy imports)
+TOOLS = {
+    'check': ('check_jsbsim', 'check_controls_and_thrust', ('jsbsim',)),
+    'inspect': ('inspect_jsbsim_physics', 'inspect_physics', ('jsbsim',)),
+    'bench': ('benchmark_jsbsim', 'main', ('numpy', 'jsbsim')),
+}
+# 스크립트 전에 따로 재서 어디서 시간이 드는지 나눠 보여준다
+SIM_IMPORTS = ('numpy', 'jsbsim')
+
+
+class ImportTimer:
+    def __init__(self):
+        self.phases = [('sst.cli', time.perf_counter() - _T0)]
+
+    def load(self, name):
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.phases.append((name, time.perf_counter() - start))
+        return module
+
+    def report(self, run_s, out=sys.stderr):
+        total = sum(t for _, t in self.phases)
+        print("import times (ms):", file=out)
+        for name, t in self.phases:
+            print(f"  {name:<32} {t * 1e3:8.1f}", file=out)
+        print(f"  {'total imports':<32} {total * 1e3:8.1f}", file=out)
+        print(f"  {'command':<32} {run_s * 1e3:8.1f}", file=out)
+
+
+def _script_path():
+    # 스크립트들은 저장소 루트에 있다
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m sst')
+    parser.add_argument('--import-times', action='store_true',
+                        help="print the import-time breakdown to stderr")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="time the rollout loops; write .json histograms or folded stacks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sim = commands.add_parser('sim', help="run a trajectory generator")
+    sim.add_argument('generator', choices=list(GENERATORS))
+    sim.add_argument('--plots', action='store_true', help="also render the PNGs")
+
+    # 나머지 인자는 그대로 스크립트에 넘긴다
+    for name, (module, _, _) in TOOLS.items():
+        commands.add_parser(name, help=f"run {module}.py")
+    return parser
+
+
+def main(argv=None):
+    args, script_argv = build_parser().parse_known_args(argv)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    _script_path()
+    if args.command == 'sim':
+        module, entry, heavy = GENERATORS[args.generator], 'main', SIM_IMPORTS
+        if not args.plots:
+            script_argv.append('--no-plots')
+    else:
+        module, entry, heavy = TOOLS[args.command]
+
+    timer = ImportTimer()
+    for name in heavy:
+        timer.load(name)
+    run = getattr(timer.load(module), entry)
+    if args.profile:
+        timing = importlib.import_module('sst.timing')
+        timing.enable()
+
+    start = time.perf_counter()
+    if entry == 'main':
+        run(script_argv)
+    elif script_argv:
+        build_parser().error(f"{args.command} takes no arguments: {' '.join(script_argv)}")
+    else:
+        run()
+    if args.import_times:
+        timer.report(time.perf_counter() - start)
+    if args.profile:
+        timing.report()
+        timing.write(args.profile)
@@ -0,0 +1,274 @@
+"""Shared JSBSim core: a pool of pre-loaded FGFDMExec instances.
+
+Loading an aircraft parses its XML (and every engine/system file it pulls
+in), which costs far more than a 10-20 s maneuver at 120 Hz.  The pool
+keeps loaded executors per aircraft and returns them to a pristine state
+between runs instead of constructing a new one.  Executors that log
+through a JSBSim output directive (``sst.output``) are pooled separately,
+per aircraft and directive.
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import jsbsim
+
+from sst.output import discard, output_index
+from sst.properties import PropertyCache
+
+JSBSIM_ROOT = os.path.dirname(jsbsim.__file__)
+AIRCRAFT = ('f16', 'c172x')
+
+# IC 속성들은 서로 연동된다 (theta/alpha/gamma, vc/vt 등).
+# 이전 런의 값이 남아 있으면 같은 IC를 줘도 다른 상태가 나오므로
+# 로드 직후 값으로 이 순서대로 되돌린 다음 새 IC를 적용한다.
+IC_BASELINE = (
+    'ic/lat-geod-deg',
+    'ic/long-gc-deg',
+    'ic/h-sl-ft',
+    'ic/psi-true-deg',
+    'ic/phi-deg',
+    'ic/alpha-deg',
+    'ic/beta-deg',
+    'ic/gamma-deg',
+    'ic/vt-fps',
+    'ic/p-rad_sec',
+    'ic/q-rad_sec',
+    'ic/r-rad_sec',
+)
+
+
+# 버전 2 IC 파일은 속도 벡터를 절대값으로 설정한다.  ic/* 속성 setter들은
+# 이전 IC의 반올림 오차로 생긴 미세한 바람 성분을 계속 보존하기 때문에
+# (수직 성분은 속성으로 지울 수도 없다) 매 리셋마다 이 파일로 먼저 덮어쓴다.
+BASELINE_IC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_ic.xml')
+
+
+# FCS 필터 계수는 모델 로드 시점의 dt 로 정해진다. 모든 실행기는 JSBSim 기본값에서
+# 로드한 뒤 set_dt 로 바꾼다 (스크립트로 로드할 때도 같은 값을 쓴다).
+LOAD_DT = 1.0 / 120.0
+
+
+def create_fdm(aircraft):
+    fdm = jsbsim.FGFDMExec(JSBSIM_ROOT)
+    fdm.set_debug_level(0)
+    fdm.load_model(aircraft)
+    return fdm
+
+
+@contextmanager
+def _quiet_stdout():
+    # JSBSim(C++)이 fd 1 에 직접 쓰는 안내문을 막는다 (오류는 stderr 로 그대로 나간다)
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, 1)
+        yield
+    finally:
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+
+def _pristine_state(fdm):
+    ic = [(name, fdm.get_property_value(name)) for name in IC_BASELINE]
+    rw = []
+    for entry in fdm.get_property_catalog():
+        name, mode = entry.rsplit(' ', 1)
+        if mode == '(RW)' and not name.startswith('ic/'):
+            rw.append((name, fdm.get_property_value(name)))
+    return ic, rw
+
+
+class FDMPool:
+    """Per-aircraft pool of loaded executors.
+
+    ``acquire`` hands out an executor that has been reset to the given
+    initial condition; ``release`` returns it for reuse.  ``ic`` is an
+    ordered mapping of property paths applied before the IC is run, so it
+    may also carry engine state such as ``propulsion/engine[0]/set-running``.
+
+    ``script`` (JSBSim ``<runscript>`` text) gets an executor with the
+    script loaded instead.  An executor cannot load another script, so
+    scripted ones are only reused for the identical script text: the last
+    ``max_idle`` released ones are kept, and any other script pays a
+    fresh model load.
+
+    ``output`` (a ``sst.output.NativeOutput``) lends an executor carrying
+    that directive, writing to a new file (``output_path``) from the
+    reset on; the file is deleted on ``release``.
+    """
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._pristine = {}
+        self._aircraft = {}
+        self._properties = {}
+        self._scripted = {}
+        self._script_idle = []
+        self._outputs = {}
+
+    def acquire(self, aircraft, ic=None, dt=None, script=None, output=None):
+        if script is not None:
+            return self._acquire_scripted(aircraft, script, ic, dt, output)
+        idle = self._idle.get(_idle_key(aircraft, output))
+        if idle:
+            fdm = idle.pop()
+        else:
+            fdm = create_fdm(aircraft)
+            self._aircraft[id(fdm)] = aircraft
+            self._properties[id(fdm)] = PropertyCache(fdm)
+            if aircraft not in self._pristine:
+                self._pristine[aircraft] = _pristine_state(fdm)
+            if output is not None:
+                self._attach(fdm, output)
+        if output is not None:
+            self._open_output(fdm)
+        self.reset(fdm, ic, dt)
+        return fdm
+
+    def _attach(self, fdm, output):
+        index = output_index(fdm)
+        # 지시문도 파일 경로로만 로드된다; 실제 기록 파일은 acquire 마다 바꾼다
+        with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False) as f:
+            f.write(output.directive(os.devnull, fdm.get_delta_t()))
+        try:
+            loaded = fdm.set_output_directive(f.name)
+        finally:
+            os.unlink(f.name)
+        if not loaded:
+            raise RuntimeError(f"JSBSim could not load the output directive for {output.properties}")
+        self._outputs[id(fdm)] = [output, index, None]
+
+    def _open_output(self, fdm):
+        fd, path = tempfile.mkstemp(prefix='sst-', suffix='.csv')
+        os.close(fd)
+        self._outputs[id(fdm)][2] = path
+
+    def output_path(self, fdm):
+        """File the executor's output directive writes to in this run."""
+        return self._outputs[id(fdm)][2]
+
+    def _acquire_scripted(self, aircraft, script, ic, dt, output=None):
+        if aircraft not in self._pristine:
+            self.release(self.acquire(aircraft))
+        key = (aircraft, script, output)
+        for k, (idle_key, idle) in enumerate(self._script_idle):
+            if idle_key == key:
+                # 같은 스크립트를 실은 실행기: 리셋하면 이벤트도 처음부터 다시 돈다
+                del self._script_idle[k]
+                fdm = idle
+                break
+        else:
+            fdm = self._load_script(aircraft, script)
+            self._aircraft[id(fdm)] = aircraft
+            self._properties[id(fdm)] = PropertyCache(fdm)
+            self._scripted[id(fdm)] = key
+            if output is not None:
+                self._attach(fdm, output)
+        if output is not None:
+            self._open_output(fdm)
+        self.reset(fdm, ic, dt)
+        return fdm
+
+    def _load_script(self, aircraft, script):
+        fdm = jsbsim.FGFDMExec(JSBSIM_ROOT)
+        fdm.set_debug_level(0)
+        # load_script 는 파일 경로만 받는다; 모델도 스크립트가 로드한다
+        with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False) as f:
+            f.write(script)
+        try:
+            # IC 파일을 바꿔 준다는 안내문이 매번 stdout 에 찍힌다
+            with _quiet_stdout():
+                loaded = fdm.load_script(f.name, 0.0, BASELINE_IC_FILE)
+        finally:
+            os.unlink(f.name)
+        if not loaded:
+            raise RuntimeError(f"JSBSim could not load the script for {aircraft}")
+        return fdm
+
+    def release(self, fdm):
+        aircraft = self._aircraft[id(fdm)]
+        output = self._outputs.get(id(fdm))
+        if output is not None:
+            discard(output[2])
+            output[2] = None
+        if id(fdm) in self._scripted:
+            # 스크립트 실행기는 최근 max_idle 개만 남긴다 (스크립트마다 따로라 쌓이기 쉽다)
+            self._script_idle.append((self._scripted[id(fdm)], fdm))
+            if len(self._script_idle) > self.max_idle:
+                self._forget(self._script_idle.pop(0)[1])
+            return
+        idle = self._idle.setdefault(_idle_key(aircraft, output and output[0]), [])
+        if len(idle) < self.max_idle:
+            idle.append(fdm)
+        else:
+            self._forget(fdm)
+
+    def _forget(self, fdm):
+        self._scripted.pop(id(fdm), None)
+        self._outputs.pop(id(fdm), None)
+        del self._aircraft[id(fdm)]
+        del self._properties[id(fdm)]
+
+    @contextmanager
+    def borrow(self, aircraft, ic=None, dt=None, output=None):
+        fdm = self.acquire(aircraft, ic, dt, output=output)
+        try:
+            yield fdm
+        finally:
+            self.release(fdm)
+
+    def properties(self, fdm):
+        """Resolved property handles that live as long as ``fdm``."""
+        return self._properties[id(fdm)]
+
+    def reset(self, fdm, ic=None, dt=None):
+        baseline, rw = self._pristine[self._aircraft[id(fdm)]]
+        props = self._properties[id(fdm)]
+        fdm.get_ic().load(BASELINE_IC_FILE, False)
+        for name, value in baseline:
+            props.setter(name)(value)
+        for name, value in rw:
+            node = props.node(name)
+            if node.get_double_value() != value:
+                node.set_double_value(value)
+        for name, value in (ic or {}).items():
+            props.setter(name)(value)
+        if dt is not None:
+            fdm.set_dt(dt)
+        # 첫 번째 리셋 후에도 FCS/엔진 필터에 이전 런의 흔적이 남는다.
+        # 한 번 더 리셋하면 새로 로드한 모델과 같은 궤적이 나온다.
+        output = self._outputs.get(id(fdm))
+        if output is None:
+            fdm.reset_to_initial_conditions(0)
+            fdm.reset_to_initial_conditions(0)
+            return fdm
+        # 리셋마다 출력 파일을 다시 여는데, 이미 열린 파일은 열지 못하고 출력이 꺼진다.
+        # mode 1 리셋은 파일을 먼저 닫으므로 첫 리셋은 /dev/null 로 보내고 두 번째에 이번 런의
+        # 파일을 연다.  이름을 다시 주지 않으면 mode 1 이 '_N' 을 붙인 새 파일을 만든다
+        # (기체 파일에 들어 있는 출력도 마찬가지라 함께 /dev/null 로 보낸다).
+        _, index, path = output
+        for name in (os.devnull, path or os.devnull):
+            for i in range(index):
+                fdm.set_output_filename(i, os.devnull)
+            fdm.set_output_filename(index, name)
+            fdm.reset_to_initial_conditions(1)
+        return fdm
+
+
+def _idle_key(aircraft, output):
+    return aircraft if output is None else (aircraft, output)
+
+
+_default_pool = None
+
+
+def default_pool():
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = FDMPool()
+    return _default_pool
@@ -0,0 +1,300 @@
+"""Sharded on-disk trajectory dataset for world-model training.
+
+Each shard is a pair of plain ``.npy`` files, ``shard-NNNNN.state.npy`` and
+``shard-NNNNN.action.npy``, holding ``(steps, channels)`` arrays of one
+fixed dtype.  Rollouts are appended back to back; a shard is closed as
+soon as it reaches ``shard_steps`` rows, so a long (streamed) rollout
+continues in the next shard and memory stays bounded by one shard.  A
+small ``index.json`` lists the channel names, the shards and, per episode,
+its ``[shard, offset, length]`` segments plus scenario metadata (aircraft,
+IC, seed, dt, decimation).
+
+``.npy`` rather than ``.npz`` because members of a zip archive cannot be
+memory-mapped; the reader opens shards with ``mmap_mode='r'`` so windows
+are served straight from the page cache without loading a shard into RAM.
+Only the rare window that straddles a shard boundary is copied.
+"""
+import json
+import os
+
+import numpy as np
+
+INDEX = 'index.json'
+FORMAT_VERSION = 1
+
+
+def scenario_meta(scenario, seed=None, **extra):
+    """Index metadata for a ``sst.rollout.Scenario``."""
+    meta = {
+        'name': scenario.name,
+        'aircraft': scenario.aircraft,
+        'altitude_ft': scenario.altitude_ft,
+        'speed_kts': scenario.speed_kts,
+        'ic': dict(scenario.ic),
+        'throttle': scenario.throttle,
+        'seed': seed,
+        'dt': scenario.dt,
+        'decimation': scenario.record_every(),
+        'control_hz': scenario.control_hz,
+    }
+    meta.update(extra)
+    return meta
+
+
+def _shard_paths(root, shard):
+    stem = os.path.join(root, f'shard-{shard:05d}')
+    return stem + '.state.npy', stem + '.action.npy'
+
+
+class DatasetWriter:
+    """Appends rollouts to a sharded dataset under ``root``.
+
+    ``state`` and ``action`` name the recorded channels (keys of the
+    ``run_scenario`` / ``TrajectoryRecorder.columns()`` dict) that make up
+    the two arrays.  A shard is written out once it holds ``shard_steps``
+    rows; only the open shard lives in memory.
+
+    Episodes can be written in one call with ``add``, from a chunk
+    iterator with ``extend``, or piecewise with ``begin`` / ``append`` /
+    ``end``.  Rows are copied on ``append``, so chunks may be views into a
+    buffer the producer reuses.  A chunk's ``'termination'`` entry (see
+    ``sst.rollout``) is stored in the episode meta.  An existing dataset
+    is extended.
+
+    The index on disk only lists episodes whose rows are in written
+    shards, so after an interruption the dataset is consistent up to the
+    last shard.  Episodes whose meta carries a ``'digest'`` (see
+    ``sst.build.spec_digest``) show up in ``digests()``, which a resumed
+    build uses to skip them.  An episode interrupted by an exception inside
+    the ``with`` block is dropped (``abort``), so it is built again.
+    """
+
+    def __init__(self, root, state, action, shard_steps=1_000_000, dtype='float32'):
+        self.root = root
+        self.shard_steps = shard_steps
+        os.makedirs(root, exist_ok=True)
+
+        index_path = os.path.join(root, INDEX)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+            if self.index['state'] != list(state) or self.index['action'] != list(action):
+                raise ValueError(f"{root}: channels do not match the existing dataset")
+            if self.index['dtype'] != np.dtype(dtype).name:
+                raise ValueError(f"{root}: dataset dtype is {self.index['dtype']}")
+        else:
+            self.index = {'version': FORMAT_VERSION, 'state': list(state),
+                          'action': list(action), 'dtype': np.dtype(dtype).name,
+                          'shards': [], 'episodes': []}
+        self.dtype = np.dtype(self.index['dtype'])
+
+        self._states = []
+        self._actions = []
+        self._rows = 0
+        self._episode = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 예외로 끊긴 에피소드는 버린다: 끝나지 않은 digest 가 남으면 이어 돌 때 건너뛴다
+        if exc_type is not None:
+            self.abort()
+        self.close()
+
+    @property
+    def state_channels(self):
+        return self.index['state']
+
+    @property
+    def action_channels(self):
+        return self.index['action']
+
+    def digests(self):
+        """``meta['digest']`` of every episode already in the dataset."""
+        return {e['meta']['digest'] for e in self.index['episodes'] if 'digest' in e['meta']}
+
+    def _stack(self, data, names):
+        return np.column_stack([np.asarray(data[n], dtype=self.dtype) for n in names])
+
+    def begin(self, meta=None):
+        if self._episode is not None:
+            raise RuntimeError("previous episode was not ended")
+        self._episode = {'segments': [], 'length': 0, 'meta': meta or {}}
+
+    def append(self, data):
+        """Add rows (a dict of equal-length channel columns) to the open episode."""
+        if self._episode is None:
+            raise RuntimeError("append() outside begin()/end()")
+        if 'termination' in data:
+            self._episode['meta']['termination'] = str(data['termination'])
+        states = self._stack(data, self.state_channels)
+        actions = self._stack(data, self.action_channels)
+        start = 0
+        while start < len(states):
+            take = min(len(states) - start, self.shard_steps - self._rows)
+            self._put(states[start:start + take], actions[start:start + take])
+            start += take
+            if self._rows >= self.shard_steps:
+                self._flush()
+
+    def _put(self, states, actions):
+        shard = len(self.index['shards'])
+        segments = self._episode['segments']
+        if segments and segments[-1][0] == shard:
+            segments[-1][2] += len(states)
+        else:
+            segments.append([shard, self._rows, len(states)])
+        self._states.append(states)
+        self._actions.append(actions)
+        self._rows += len(states)
+        self._episode['length'] += len(states)
+
+    def end(self):
+        episode, self._episode = self._episode, None
+        if episode['length']:
+            self.index['episodes'].append(episode)
+        return episode
+
+    def add(self, data, meta=None):
+        """Write one whole rollout as an episode."""
+        self.begin(meta)
+        self.append(data)
+        return self.end()
+
+    def extend(self, chunks, meta=None):
+        """Write an iterator of chunks (e.g. ``iter_scenario``) as one episode.
+
+        Each chunk is persisted before the next one is requested, so a
+        generator producer is paced by the writer.
+        """
+        self.begin(meta)
+        for chunk in chunks:
+            self.append(chunk)
+        return self.end()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        shard = len(self.index['shards'])
+        state_path, action_path = _shard_paths(self.root, shard)
+        np.save(state_path, np.concatenate(self._states))
+        np.save(action_path, np.concatenate(self._actions))
+        self.index['shards'].append({'state': os.path.basename(state_path),
+                                     'action': os.path.basename(action_path),
+                                     'steps': self._rows})
+        self._states, self._actions, self._rows = [], [], 0
+        self._write_index()
+
+    def _write_index(self):
+        path = os.path.join(self.root, INDEX)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp, path)
+
+    def abort(self):
+        """Drop the open episode (nothing of it gets into the index).
+
+        Its rows still in memory are removed; rows already in written
+        shards stay there unreferenced.
+        """
+        episode, self._episode = self._episode, None
+        if episode is None:
+            return
+        shard = len(self.index['shards'])
+        for segment_shard, offset, _ in episode['segments']:
+            if segment_shard == shard:
+                self._states = [np.concatenate(self._states)[:offset]] if offset else []
+                self._actions = [np.concatenate(self._actions)[:offset]] if offset else []
+                self._rows = offset
+                break
+
+    def close(self):
+        if self._episode is not None:
+            self.end()
+        self._flush()
+        self._write_index()
+
+
+class DatasetReader:
+    """Memory-mapped ``(state, action, next_state)`` windows over a dataset.
+
+    Window ``j`` is ``horizon`` consecutive steps of one episode::
+
+        state[t:t+h], action[t:t+h], state[t+1:t+h+1]
+
+    so an episode of ``n`` rows yields ``n - horizon`` windows.  Returned
+    arrays are read-only views into the memory-mapped shards.
+    """
+
+    def __init__(self, root, horizon=1):
+        self.root = root
+        self.horizon = horizon
+        with open(os.path.join(root, INDEX)) as f:
+            self.index = json.load(f)
+        n_shards = len(self.index['shards'])
+        self.episodes = [e for e in self.index['episodes']
+                         if all(seg[0] < n_shards for seg in e['segments'])]
+        self._shards = {}
+
+        counts = np.array([max(e['length'] - horizon, 0) for e in self.episodes], dtype=np.int64)
+        self._window_start = np.concatenate([[0], np.cumsum(counts)])
+
+    @property
+    def state_channels(self):
+        return self.index['state']
+
+    @property
+    def action_channels(self):
+        return self.index['action']
+
+    def _shard(self, shard):
+        arrays = self._shards.get(shard)
+        if arrays is None:
+            entry = self.index['shards'][shard]
+            arrays = (np.load(os.path.join(self.root, entry['state']), mmap_mode='r'),
+                      np.load(os.path.join(self.root, entry['action']), mmap_mode='r'))
+            self._shards[shard] = arrays
+        return arrays
+
+    def _rows(self, episode, start, stop):
+        """``(state, action)`` rows ``start:stop`` of an episode."""
+        states, actions = [], []
+        base = 0
+        for shard, offset, length in episode['segments']:
+            lo, hi = max(start - base, 0), min(stop - base, length)
+            if lo < hi:
+                s, a = self._shard(shard)
+                states.append(s[offset + lo:offset + hi])
+                actions.append(a[offset + lo:offset + hi])
+            base += length
+        if len(states) == 1:
+            return states[0], actions[0]
+        return np.concatenate(states), np.concatenate(actions)
+
+    def episode(self, i):
+        """``(state, action)`` arrays of episode ``i``."""
+        e = self.episodes[i]
+        return self._rows(e, 0, e['length'])
+
+    def __len__(self):
+        return int(self._window_start[-1])
+
+    def locate(self, j):
+        """``(episode, step)`` of window ``j``."""
+        if not 0 <= j < len(self):
+            raise IndexError(j)
+        i = int(np.searchsorted(self._window_start, j, side='right')) - 1
+        return i, int(j - self._window_start[i])
+
+    def __getitem__(self, j):
+        i, t = self.locate(j)
+        h = self.horizon
+        states, actions = self._rows(self.episodes[i], t, t + h + 1)
+        return states[:h], actions[:h], states[1:]
+
+    def batch(self, indices):
+        """Stacked ``(B, horizon, channels)`` arrays for a list of window indices."""
+        windows = [self[j] for j in indices]
+        return tuple(np.stack(parts) for parts in zip(*windows))
@@ -0,0 +1,280 @@
+"""Multi-aircraft engagements stepped in lockstep.
+
+An ``Engagement`` is two or more participants, each a ``Scenario`` that
+gives its start state (altitude, speed, ``ic`` with position/heading,
+``trim``/``warmup``) and its own maneuver schedule.  ``run_engagement``
+starts one pooled executor per participant and advances them together:
+every physics step runs each FDM once, controls are applied on the
+participants' control ticks, and all of them are recorded on the same
+``record_hz`` tick.  Any participant's guard ends the engagement.
+
+Relative geometry is derived after the run for every recorded tick at
+once: positions go to a shared north/east/down frame (origin at the first
+participant's first sample) and ``relative_geometry`` computes range,
+closure, aspect angle and antenna train angle for all ordered pairs as
+``(ticks, pairs)`` arrays, from the raw channels; units and normalization
+of a participant's ``channels`` schema are applied after that.
+``run_engagements`` spreads many engagements over the batch worker pool.
+"""
+import logging
+import os
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from itertools import repeat
+
+import numpy as np
+
+from sst.frames import FT, geodetic_to_ned
+from sst.guards import GuardMonitor, Termination
+from sst.observation import schema_from_spec
+from sst.recorder import TrajectoryRecorder
+from sst.rollout import start_fdm
+from sst.schedule import (CONTROL, GUARD, RECORD, ClosedLoopLogic, EventPlayer, compile_maneuvers,
+                          quantize_events, rate_steps, step_times, tick_plan, trace_logic)
+from sst.snapshot import default_store
+
+log = logging.getLogger(__name__)
+
+# 상대 기하 계산에 필요한 상태 (모든 참가 기체에 대해 기록한다)
+STATE_CHANNELS = {
+    'lat': 'position/lat-geod-deg',
+    'lon': 'position/long-gc-deg',
+    'h_sl': 'position/h-sl-ft',
+    'vn': 'velocities/v-north-fps',
+    've': 'velocities/v-east-fps',
+    'vd': 'velocities/v-down-fps',
+    'theta': 'attitude/theta-deg',
+    'psi': 'attitude/psi-deg',
+}
+
+
+@dataclass
+class Engagement:
+    """Participants flown together for ``duration`` seconds of engagement time.
+
+    ``participants`` maps a label (``'blue'``, ``'red'``, ...) to a
+    ``Scenario``; only its start state, maneuvers, control rate, channels
+    and guards are used.  All participants must share ``dt``.  Command
+    times are on each participant's own sim clock, which is the engagement
+    clock for ``trim`` (or warmup-free) starts.  ``pairs`` lists the
+    ``(ownship, target)`` labels to derive geometry for (default: all
+    ordered pairs).
+    """
+    name: str
+    participants: dict
+    duration: float = 60.0
+    record_hz: float = 10.0
+    pairs: tuple = None
+    dtype: str = 'float64'
+
+    def all_pairs(self):
+        if self.pairs is not None:
+            return [tuple(p) for p in self.pairs]
+        labels = list(self.participants)
+        return [(a, b) for a in labels for b in labels if a != b]
+
+
+def nose_vector(theta_deg, psi_deg):
+    """Unit body x-axis in north/east/down for pitch and heading (deg)."""
+    theta = np.radians(theta_deg)
+    psi = np.radians(psi_deg)
+    return np.stack([np.cos(theta) * np.cos(psi),
+                     np.cos(theta) * np.sin(psi),
+                     -np.sin(theta)], axis=-1)
+
+
+def relative_geometry(pos, vel, nose, pairs):
+    """Range, closure, aspect and ATA of ``pairs`` of ``(own, target)`` indices.
+
+    ``pos`` and ``vel`` are ``(..., aircraft, 3)`` north/east/down arrays,
+    ``nose`` the matching unit body x-axes.  Returns ``(..., pairs)``
+    arrays: ``range`` (pos units), ``closure`` (range decreasing is
+    positive), ``aspect`` (deg off the target's tail: 0 = at its six, 180 =
+    head-on) and ``ata`` (deg off the ownship's nose).
+    """
+    own, target = (np.asarray(ix) for ix in zip(*pairs))
+    los = pos[..., target, :] - pos[..., own, :]
+    rng = np.linalg.norm(los, axis=-1)
+    safe = np.where(rng > 0.0, rng, 1.0)
+    unit = los / safe[..., None]
+    closure = -np.einsum('...k,...k->...', vel[..., target, :] - vel[..., own, :], unit)
+    cos_aspect = np.einsum('...k,...k->...', nose[..., target, :], unit)
+    cos_ata = np.einsum('...k,...k->...', nose[..., own, :], unit)
+    return {
+        'range': rng,
+        'closure': closure,
+        'aspect': np.degrees(np.arccos(np.clip(cos_aspect, -1.0, 1.0))),
+        'ata': np.degrees(np.arccos(np.clip(cos_ata, -1.0, 1.0))),
+    }
+
+
+def engagement_geometry(data, labels, pairs):
+    """Shared-frame positions and pair geometry from recorded ``data``.
+
+    Adds ``<label>_north``/``_east``/``_down`` (ft) and
+    ``<own>_<target>_range``/``_closure``/``_aspect``/``_ata`` entries.
+    """
+    origin = (data[f'{labels[0]}_lat'][0], data[f'{labels[0]}_lon'][0],
+              data[f'{labels[0]}_h_sl'][0] * FT)
+    pos, vel, nose = [], [], []
+    for label in labels:
+        north, east, down = geodetic_to_ned(data[f'{label}_lat'], data[f'{label}_lon'],
+                                            data[f'{label}_h_sl'] * FT, origin)
+        xyz = np.stack([north, east, down], axis=-1) / FT
+        data[f'{label}_north'], data[f'{label}_east'], data[f'{label}_down'] = xyz.T
+        pos.append(xyz)
+        vel.append(np.stack([data[f'{label}_vn'], data[f'{label}_ve'], data[f'{label}_vd']], axis=-1))
+        nose.append(nose_vector(data[f'{label}_theta'], data[f'{label}_psi']))
+    index = {label: j for j, label in enumerate(labels)}
+    geometry = relative_geometry(np.stack(pos, axis=1), np.stack(vel, axis=1),
+                                 np.stack(nose, axis=1),
+                                 [(index[a], index[b]) for a, b in pairs])
+    for k, (a, b) in enumerate(pairs):
+        for name, values in geometry.items():
+            data[f'{a}_{b}_{name}'] = values[:, k]
+    return data
+
+
+class _Participant:
+    """One aircraft's compiled schedule, guards and channel reader."""
+
+    def __init__(self, label, scenario, fdm, props, steps):
+        self.label = label
+        self.fdm = fdm
+        self.run = fdm.run
+        if scenario.throttle is not None:
+            props.setter('propulsion/engine[0]/set-running')(1)
+            props.setter('fcs/throttle-cmd-norm')(scenario.throttle)
+        self.schema = schema_from_spec({**STATE_CHANNELS, **scenario.channels})
+        self.names = [f'{label}_{name}' for name in self.schema.names]
+        self.reader = self.schema.reader(props)
+        guards = scenario.all_guards()
+        self.check = GuardMonitor(guards, props).check if guards else None
+        self.guard_every = scenario.guard_every
+
+        self.logic = None
+        if callable(scenario.maneuvers):
+            try:
+                events = trace_logic(scenario.maneuvers, steps)
+            except ClosedLoopLogic:
+                self.logic, events = scenario.maneuvers, []
+        else:
+            times = step_times(fdm.get_sim_time(), fdm.get_delta_t(), steps)
+            events = compile_maneuvers(scenario.maneuvers, times)
+        self.control_every = rate_steps(scenario.dt, scenario.control_hz)
+        self.events = quantize_events(events, self.control_every)
+        if scenario.script and self.logic is None:
+            # 스크립트로 로드된 실행기가 명령을 직접 적용한다
+            self.events = []
+        self.player = EventPlayer(self.events, props)
+
+    def control(self, step):
+        if self.logic is not None:
+            if step % self.control_every == 0:
+                self.logic(self.fdm, step)
+        elif self.player.next_step == step:
+            self.player.play(step)
+
+
+def _check_guards(crew, time):
+    """Termination for the first participant out of its envelope (reason ``label:guard``)."""
+    for p in crew:
+        violation = p.check()
+        if violation is not None:
+            termination = GuardMonitor.termination(violation, time)
+            return replace(termination, reason=f'{p.label}:{termination.reason}')
+    return Termination()
+
+
+def run_engagement(engagement, store=None):
+    """Fly ``engagement`` and return its recorded and derived arrays.
+
+    Keys are ``'t'`` (engagement time), ``<label>_<channel>`` per
+    participant, the shared-frame positions and pair geometry of
+    ``engagement_geometry``, and ``'termination'``.
+    """
+    store = store or default_store()
+    labels = list(engagement.participants)
+    scenarios = [engagement.participants[label] for label in labels]
+    dt = scenarios[0].dt
+    if any(s.dt != dt for s in scenarios):
+        raise ValueError(f"participants of '{engagement.name}' fly at different dt")
+    steps = int(round(engagement.duration / dt))
+    decimation = rate_steps(dt, engagement.record_hz)
+
+    with ExitStack() as stack:
+        crew = []
+        for label, scenario in zip(labels, scenarios):
+            fdm = stack.enter_context(start_fdm(scenario, store))
+            crew.append(_Participant(label, scenario, fdm, store.pool.properties(fdm), steps))
+        runs = [p.run for p in crew]
+        checked = [p for p in crew if p.check is not None]
+
+        # 기체별 제어/가드 틱을 합쳐 한 번의 틱 계획으로 돈다
+        event_steps = sorted({step for p in crew for step, _, _ in p.events})
+        logic_every = min((p.control_every for p in crew if p.logic is not None), default=None)
+        guard_every = min((p.guard_every or p.control_every for p in checked), default=None)
+        ticks, flags = tick_plan(steps, event_steps, logic_every, guard_every, decimation)
+
+        names = ['t'] + [name for p in crew for name in p.names]
+        # 단위 변환이 있는 기체가 있으면 원시값을 float64 로 모은다
+        raw_dtype = np.result_type(*[p.schema.raw_dtype(engagement.dtype) for p in crew])
+        recorder = TrajectoryRecorder(names, steps, decimation, raw_dtype)
+        readers = []
+        offset = 1
+        for p in crew:
+            readers.append((p.reader.read_into, offset))
+            offset += len(p.names)
+        termination = Termination()
+
+        done = 0
+        for i, flag in zip(ticks, flags):
+            for _ in repeat(None, i - done):
+                for run in runs:
+                    run()
+            done = i + 1
+
+            if flag & CONTROL:
+                for p in crew:
+                    p.control(i)
+
+            for run in runs:
+                run()
+
+            if flag & GUARD:
+                termination = _check_guards(checked, (i + 1) * dt)
+                if not termination.completed:
+                    log.info("[%s] terminated, %s", engagement.name, termination)
+                    break
+
+            if flag & RECORD:
+                row = recorder.slot()
+                row[0] = i * dt
+                for read_into, at in readers:
+                    read_into(row, at)
+        else:
+            for _ in repeat(None, steps - done):
+                for run in runs:
+                    run()
+
+    data = {name: values.copy() for name, values in recorder.columns().items()}
+    # 기하 계산은 원시 단위(ft, deg, fps)로 하고, 채널 변환은 그 뒤에 기체별로 한 번에
+    engagement_geometry(data, labels, engagement.all_pairs())
+    count = len(recorder)
+    data['t'] = data['t'].astype(engagement.dtype, copy=False)
+    for p, (_, at) in zip(crew, readers):
+        if not p.schema.identity or raw_dtype != np.dtype(engagement.dtype):
+            converted = p.schema.columns(recorder.buffer[at:at + len(p.names), :count],
+                                         engagement.dtype)
+            data.update({f'{p.label}_{name}': values for name, values in converted.items()})
+    data['termination'] = termination.reason
+    return data
+
+
+def run_engagements(engagements, workers=None, chunksize=1, store_path=None):
+    """``run_engagement`` for each engagement over the batch worker pool, in order."""
+    from sst.batch import iter_batch
+    engagements = list(engagements)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(engagements)) or 1
+    return list(iter_batch(run_engagement, engagements, workers, chunksize, store_path))
@@ -0,0 +1,84 @@
+"""Vectorized local-frame position reconstruction.
+
+Positions are derived after the run from recorded channels instead of
+being integrated with scalar trig inside the step loop.  The geodetic
+path (lat/lon/alt -> ECEF -> NED at the first sample) is exact and is what
+every script uses; ``integrate_velocity`` is for recordings that only
+carry airspeed and attitude (``generate_catalog_scenarios`` falls back to
+it), and drifts from the geodetic track in turns, where the velocity is
+not along the heading.
+"""
+import numpy as np
+
+FT = 0.3048
+WGS84_A = 6378137.0
+WGS84_E2 = 6.69437999014e-3
+
+# 궤적 복원에 필요한 채널 (rollout channels에 그대로 넣어 쓴다)
+POSITION_CHANNELS = {
+    'lat': 'position/lat-geod-deg',
+    'lon': 'position/long-gc-deg',
+    'h_sl': 'position/h-sl-ft',
+}
+
+
+def geodetic_to_ecef(lat_deg, lon_deg, h_m):
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    sin_lat = np.sin(lat)
+    cos_lat = np.cos(lat)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat**2)
+    x = (n + h_m) * cos_lat * np.cos(lon)
+    y = (n + h_m) * cos_lat * np.sin(lon)
+    z = (n * (1.0 - WGS84_E2) + h_m) * sin_lat
+    return x, y, z
+
+
+def geodetic_to_ned(lat_deg, lon_deg, h_m, origin=None):
+    """North/east/down (m) of each sample relative to ``origin`` (default: first sample)."""
+    lat_deg = np.asarray(lat_deg, dtype=float)
+    lon_deg = np.asarray(lon_deg, dtype=float)
+    h_m = np.asarray(h_m, dtype=float)
+    if origin is None:
+        origin = (lat_deg.flat[0], lon_deg.flat[0], h_m.flat[0])
+    x, y, z = geodetic_to_ecef(lat_deg, lon_deg, h_m)
+    x0, y0, z0 = geodetic_to_ecef(*origin)
+    dx, dy, dz = x - x0, y - y0, z - z0
+
+    lat0, lon0 = np.radians(origin[0]), np.radians(origin[1])
+    sin_lat, cos_lat = np.sin(lat0), np.cos(lat0)
+    sin_lon, cos_lon = np.sin(lon0), np.cos(lon0)
+    north = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+    east = -sin_lon * dx + cos_lon * dy
+    down = -cos_lat * cos_lon * dx - cos_lat * sin_lon * dy - sin_lat * dz
+    return north, east, down
+
+
+def integrate_velocity(vt, theta, psi, dt):
+    """Dead-reckoned north/east/down from true airspeed and attitude (radians).
+
+    Uses pitch as the flight-path angle (no wind, no alpha), cumulating
+    the displacement after each step like the old in-loop integration.
+    """
+    step = np.asarray(vt) * dt
+    horizontal = step * np.cos(theta)
+    north = np.cumsum(horizontal * np.cos(psi))
+    east = np.cumsum(horizontal * np.sin(psi))
+    down = -np.cumsum(step * np.sin(theta))
+    return north, east, down
+
+
+def ned_to_enu(north, east, down):
+    return east, north, -np.asarray(down)
+
+
+def local_track(lat_deg, lon_deg, h_sl_ft, unit=1.0):
+    """``(n, 3)`` rows of [north, east, altitude].
+
+    North/east are relative to the first sample, altitude stays absolute
+    (MSL), which is the layout the validation plots expect.  ``unit`` is the
+    output length unit in metres: 1.0 for metres, ``FT`` for feet.
+    """
+    h_m = np.asarray(h_sl_ft, dtype=float) * FT
+    north, east, _ = geodetic_to_ned(lat_deg, lon_deg, h_m)
+    return np.column_stack([north, east, h_m]) / unit
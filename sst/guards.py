@@ -0,0 +1,145 @@
+"""Envelope guards that end a rollout early and say why.
+
+A ``Guard`` is a named ``low <= value <= high`` range on one property.
+During a rollout a ``GuardMonitor`` reads the guarded properties through
+cached node getters after each step; the first value out of range (NaN
+never is in range) ends the run.  ``Termination.reason`` is the guard name,
+``'nan'`` for a non-finite value, or ``'completed'`` if the run went the
+full duration.
+
+``GUARDS`` holds presets for ground proximity, over-G, alpha excursion,
+overspeed and NaN states; ``guards_from_spec`` builds a guard list from
+the catalog form ``{"ground": 100, "over_g": [-3, 9], "nan": true}``.
+"""
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+COMPLETED = 'completed'
+NAN = 'nan'
+
+
+@dataclass(frozen=True)
+class Guard:
+    name: str
+    path: str
+    low: float = -math.inf
+    high: float = math.inf
+
+    def __str__(self):
+        if self.low == -math.inf:
+            return f"{self.path} <= {self.high:g}"
+        if self.high == math.inf:
+            return f"{self.path} >= {self.low:g}"
+        return f"{self.low:g} <= {self.path} <= {self.high:g}"
+
+
+@dataclass(frozen=True)
+class Termination:
+    reason: str = COMPLETED
+    time: float = None
+    path: str = None
+    value: float = None
+
+    @property
+    def completed(self):
+        return self.reason == COMPLETED
+
+    def __str__(self):
+        if self.completed:
+            return COMPLETED
+        return f"{self.reason} at t={self.time:.2f}s ({self.path}={self.value:g})"
+
+
+# F-16 급 기본값
+GUARDS = {
+    'ground': Guard('ground', 'position/h-agl-ft', low=100.0),
+    'over_g': Guard('over_g', 'accelerations/Nz', low=-3.0, high=9.0),
+    'alpha': Guard('alpha', 'aero/alpha-deg', low=-20.0, high=35.0),
+    'overspeed': Guard('overspeed', 'velocities/vc-kts', high=800.0),
+    'mach': Guard('mach', 'velocities/mach', high=2.0),
+    # 범위 없음: NaN/inf 만 잡는다
+    'nan': Guard(NAN, 'velocities/u-fps'),
+}
+ENVELOPE = ('ground', 'over_g', 'alpha', 'overspeed', 'nan')
+
+
+def guard(name, limit=True):
+    """Preset ``name`` adjusted by ``limit``.
+
+    ``True`` keeps the defaults, a number replaces the preset's one-sided
+    bound, ``[low, high]`` replaces both and a dict replaces any fields
+    (e.g. ``{"path": "position/h-sl-ft", "low": 328}``).
+    """
+    preset = GUARDS[name]
+    if limit is True:
+        return preset
+    if isinstance(limit, dict):
+        return replace(preset, **limit)
+    if isinstance(limit, (list, tuple)):
+        low, high = limit
+        return replace(preset, low=-math.inf if low is None else float(low),
+                       high=math.inf if high is None else float(high))
+    if preset.high == math.inf:
+        return replace(preset, low=float(limit))
+    if preset.low == -math.inf:
+        return replace(preset, high=float(limit))
+    raise ValueError(f"guard '{name}' has two bounds; give [low, high]")
+
+
+def guards_from_spec(spec):
+    """Guard list from a ``{name: limit}`` dict (``False``/``None`` skip), a name list or guards."""
+    if isinstance(spec, dict):
+        return [guard(name, limit) for name, limit in spec.items()
+                if limit is not None and limit is not False]
+    return [g if isinstance(g, Guard) else guard(g) for g in spec]
+
+
+def envelope(**limits):
+    """The default envelope guards, with ``limits`` applied as in ``guard``."""
+    return guards_from_spec({**{name: True for name in ENVELOPE}, **limits})
+
+
+class GuardMonitor:
+    """Checks ``guards`` against the live FDM through cached getters."""
+
+    def __init__(self, guards, props):
+        self.guards = tuple(guards)
+        self._checks = tuple((props.getter(g.path), g.low, g.high, g) for g in self.guards)
+
+    def check(self):
+        """``(guard, value)`` for the first violated guard, else ``None``."""
+        for get, low, high, g in self._checks:
+            value = get()
+            if not low <= value <= high:
+                return g, value
+        return None
+
+    @staticmethod
+    def termination(violation, time):
+        g, value = violation
+        return Termination(NAN if math.isnan(value) else g.name, time, g.path, value)
+
+
+def first_violation(guards, data, channels):
+    """Scan recorded ``data`` for the first sample that breaks a guard.
+
+    ``channels`` maps column names to property paths (as in
+    ``Scenario.channels``); guards on unrecorded properties are skipped.
+    Returns a ``Termination`` (``time`` from ``data['t']`` if present).
+    """
+    columns = {path: name for name, path in channels.items()}
+    first, hit = None, None
+    for g in guards:
+        name = columns.get(g.path)
+        if name is None:
+            continue
+        values = np.asarray(data[name], dtype=float)
+        bad = np.flatnonzero(~((values >= g.low) & (values <= g.high)))
+        if len(bad) and (first is None or bad[0] < first):
+            first, hit = bad[0], (g, float(values[bad[0]]))
+    if hit is None:
+        return Termination()
+    time = float(data['t'][first]) if 't' in data else float(first)
+    return GuardMonitor.termination(hit, time)
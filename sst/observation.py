@@ -0,0 +1,253 @@
+"""Declarative observation schemas: channels, units, dtypes, normalization.
+
+A ``Channel`` names one property and how it is delivered: ``unit`` is the
+unit wanted in the data (the property's own unit is read off its JSBSim
+path suffix, ``-ft``, ``-kts``, ``-deg``, ``-rad_sec``, ...), ``norm`` is a
+``(center, scale)`` pair giving ``(value - center) / scale`` after the unit
+conversion, and ``dtype`` is the array type it is handed back as.
+``PRESETS`` holds the channels the scripts keep asking for (alt, pitch,
+roll, vel, gload, lift, thrust, ...) under one set of names.
+
+An ``ObservationSchema`` reads its raw properties through one
+``PropertyReader`` (a single batched read into the recorder's column per
+tick) and converts the finished ``(channels, samples)`` block afterwards:
+unit factor and normalization fold into one ``a * x + b`` per channel, so
+the conversion is a single vectorized pass instead of a multiply on every
+step.  A schema with no units and no normalization passes the raw arrays
+through untouched.
+
+``schema_from_spec`` accepts the catalog form: a ``{name: path}`` dict as
+in ``Scenario.channels``, ``{name: {"unit": "m", "norm": [6000, 3000]}}``
+(the path defaults to the preset of that name), ``{name: true}`` or a
+list of preset names.
+"""
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+# 단위 -> (물리량, SI 환산 계수).  JSBSim 속성 경로의 접미사 이름을 그대로 쓴다
+UNITS = {
+    'ft': ('length', 0.3048),
+    'm': ('length', 1.0),
+    'km': ('length', 1000.0),
+    'nmi': ('length', 1852.0),
+    'fps': ('speed', 0.3048),
+    'ft_sec': ('speed', 0.3048),
+    'kts': ('speed', 1852.0 / 3600.0),
+    'm/s': ('speed', 1.0),
+    'km/h': ('speed', 1.0 / 3.6),
+    'deg': ('angle', math.pi / 180.0),
+    'rad': ('angle', 1.0),
+    'deg_sec': ('rate', math.pi / 180.0),
+    'rad_sec': ('rate', 1.0),
+    'deg/s': ('rate', math.pi / 180.0),
+    'rad/s': ('rate', 1.0),
+    'ft_sec2': ('acceleration', 0.3048),
+    'm/s2': ('acceleration', 1.0),
+    'lbs': ('force', 4.4482216152605),
+    'N': ('force', 1.0),
+    'slugs': ('mass', 14.593902937206364),
+    'kg': ('mass', 1.0),
+    'sqft': ('area', 0.09290304),
+    'm2': ('area', 1.0),
+    'psf': ('pressure', 47.88025898033584),
+    'Pa': ('pressure', 1.0),
+}
+
+
+# 물리량별 SI 단위 (ObservationSchema.si)
+SI = {kind: unit for unit, (kind, factor) in UNITS.items() if factor == 1.0}
+
+
+def path_unit(path):
+    """Unit of a JSBSim property from its path suffix (``None`` if it has none we know)."""
+    leaf = path.rsplit('/', 1)[-1]
+    if '-' not in leaf:
+        return None
+    suffix = leaf.rsplit('-', 1)[-1]
+    return suffix if suffix in UNITS else None
+
+
+def unit_factor(source, target):
+    """Factor taking values in ``source`` to ``target`` units."""
+    if source not in UNITS or target not in UNITS:
+        raise ValueError(f"unknown unit: {source if source not in UNITS else target}")
+    (kind, to_si), (target_kind, from_si) = UNITS[source], UNITS[target]
+    if kind != target_kind:
+        raise ValueError(f"cannot convert {source} ({kind}) to {target} ({target_kind})")
+    return to_si / from_si
+
+
+@dataclass(frozen=True)
+class Channel:
+    """One recorded property; ``unit``/``norm``/``dtype`` say how it is delivered.
+
+    ``source`` overrides the unit read off the path.  ``dtype=None`` leaves
+    the array type to the caller (``Scenario.dtype``).
+    """
+    name: str
+    path: str
+    unit: str = None
+    norm: tuple = None
+    dtype: str = None
+    source: str = None
+
+    @property
+    def raw_unit(self):
+        return self.source or path_unit(self.path)
+
+    @property
+    def delivered_unit(self):
+        return self.unit or self.raw_unit
+
+    def affine(self):
+        """``(a, b)`` with ``a * raw + b`` the delivered value."""
+        a, b = 1.0, 0.0
+        if self.unit is not None and self.unit != self.raw_unit:
+            if self.raw_unit is None:
+                raise ValueError(f"channel '{self.name}': unit of {self.path} unknown; "
+                                 "give source")
+            a = unit_factor(self.raw_unit, self.unit)
+        if self.norm is not None:
+            center, scale = self.norm
+            a, b = a / scale, -center / scale
+        return a, b
+
+
+# 스크립트들이 제각각 적던 채널을 한 이름으로 모은다 (단위는 JSBSim 그대로)
+PRESETS = {c.name: c for c in (
+    Channel('alt', 'position/h-agl-ft'),
+    Channel('h_sl', 'position/h-sl-ft'),
+    Channel('lat', 'position/lat-geod-deg'),
+    Channel('lon', 'position/long-gc-deg'),
+    Channel('pitch', 'attitude/theta-deg'),
+    Channel('roll', 'attitude/phi-deg'),
+    Channel('heading', 'attitude/psi-deg'),
+    Channel('vel', 'velocities/vc-kts'),
+    Channel('tas', 'velocities/vt-fps'),
+    Channel('mach', 'velocities/mach'),
+    Channel('vn', 'velocities/v-north-fps'),
+    Channel('ve', 'velocities/v-east-fps'),
+    Channel('vd', 'velocities/v-down-fps'),
+    Channel('p', 'velocities/p-rad_sec'),
+    Channel('q', 'velocities/q-rad_sec'),
+    Channel('r', 'velocities/r-rad_sec'),
+    Channel('alpha', 'aero/alpha-deg'),
+    Channel('beta', 'aero/beta-deg'),
+    Channel('qbar', 'aero/qbar-psf'),
+    Channel('gload', 'accelerations/n-pilot-z-norm'),
+    Channel('nz', 'accelerations/Nz'),
+    Channel('gravity', 'accelerations/g-acceleration-ft_sec2'),
+    Channel('lift', 'forces/lift-lbs'),
+    Channel('drag', 'forces/drag-lbs'),
+    Channel('side', 'forces/side-lbs'),
+    Channel('fbz_gravity', 'forces/fbz-gravity-lbs'),
+    Channel('fbz_aero', 'forces/fbz-aero-lbs'),
+    Channel('thrust', 'propulsion/engine[0]/thrust-lbs'),
+    Channel('mass', 'inertia/mass-slugs'),
+    Channel('weight', 'inertia/weight-lbs'),
+    Channel('wing_area', 'metrics/sw-sqft'),
+    Channel('elevator', 'fcs/elevator-cmd-norm'),
+    Channel('aileron', 'fcs/aileron-cmd-norm'),
+    Channel('rudder', 'fcs/rudder-cmd-norm'),
+    Channel('throttle', 'fcs/throttle-cmd-norm'),
+    Channel('elevator_pos', 'fcs/elevator-pos-deg'),
+)}
+
+
+def channel(name, spec=True):
+    """Channel ``name`` from a schema spec entry.
+
+    A string is the property path, ``True`` the preset, and a dict sets
+    any fields (``path`` defaults to the preset's).
+    """
+    if isinstance(spec, Channel):
+        return spec if spec.name == name else replace(spec, name=name)
+    if isinstance(spec, str):
+        return Channel(name, spec)
+    if spec is True:
+        return PRESETS[name]
+    if isinstance(spec, dict):
+        fields = dict(spec)
+        if 'norm' in fields and fields['norm'] is not None:
+            fields['norm'] = tuple(fields['norm'])
+        if 'path' not in fields:
+            return replace(PRESETS[name], **fields)
+        return Channel(name, **fields)
+    raise ValueError(f"channel '{name}': cannot build from {spec!r}")
+
+
+def schema_from_spec(spec):
+    """``ObservationSchema`` from a ``{name: spec}`` dict, a list of names/channels or a schema."""
+    if isinstance(spec, ObservationSchema):
+        return spec
+    if isinstance(spec, dict):
+        return ObservationSchema([channel(name, value) for name, value in spec.items()])
+    return ObservationSchema([c if isinstance(c, Channel) else channel(c) for c in spec])
+
+
+class ObservationSchema:
+    """Ordered channels read in one batch and converted in one pass."""
+
+    def __init__(self, channels):
+        self.channels = tuple(channels)
+        self.names = [c.name for c in self.channels]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"duplicate channel names in {self.names}")
+        self.paths = [c.path for c in self.channels]
+        affine = np.array([c.affine() for c in self.channels], dtype=np.float64).reshape(-1, 2)
+        self._scale = affine[:, 0:1]
+        self._offset = affine[:, 1:2]
+        self.identity = bool(np.all(self._scale == 1.0) and np.all(self._offset == 0.0))
+
+    def __len__(self):
+        return len(self.channels)
+
+    def reader(self, props):
+        """``PropertyReader`` over the raw properties, in channel order."""
+        return props.reader(self.paths)
+
+    def raw_dtype(self, dtype):
+        """Type to record the raw values as, for data delivered as ``dtype``.
+
+        Values that are converted afterwards are recorded as float64 and
+        rounded once at the end.
+        """
+        if self.identity and all(c.dtype in (None, dtype) for c in self.channels):
+            return dtype
+        return np.float64
+
+    def dtype(self, default=np.float64):
+        """One array type for all channels (for stacked observations)."""
+        return np.result_type(*[c.dtype or default for c in self.channels])
+
+    def convert(self, block):
+        """``(channels, n)`` raw values -> delivered units and normalization, one pass."""
+        if self.identity:
+            return block
+        out = np.multiply(block, self._scale, dtype=np.float64)
+        out += self._offset
+        return out
+
+    def columns(self, block, dtype=np.float64):
+        """``{name: array}`` of the converted ``(channels, n)`` block, each in its dtype.
+
+        Channels that need neither conversion nor a new type stay views of
+        ``block``.
+        """
+        block = self.convert(block)
+        return {c.name: block[j].astype(c.dtype or dtype, copy=False)
+                for j, c in enumerate(self.channels)}
+
+    def si(self):
+        """The same channels delivered in SI units (unitless ones unchanged)."""
+        return ObservationSchema([
+            replace(c, unit=SI[UNITS[c.raw_unit][0]]) if c.raw_unit in UNITS else c
+            for c in self.channels])
+
+    def meta(self):
+        """Per-channel path, unit and normalization, for dataset indexes."""
+        return {c.name: {'path': c.path, 'unit': c.delivered_unit,
+                         'norm': list(c.norm) if c.norm is not None else None}
+                for c in self.channels}
@@ -0,0 +1,77 @@
+"""Trajectory logging by JSBSim's own output directives.
+
+Instead of reading the channels from Python on every record tick, a
+``NativeOutput`` (property list + record interval in steps) becomes a
+JSBSim ``<output type="CSV">`` directive on the executor: the C++ core
+writes one row per interval inside ``FGFDMExec::Run`` and flushes it, and
+``load_output`` parses the whole file into arrays in one pass after the
+run.
+
+``FDMPool.acquire(..., output=spec)`` lends executors that carry the
+directive (kept idle per aircraft and spec, since JSBSim cannot drop a
+directive again) and points it at a fresh file on every acquire.  JSBSim
+fixes the interval in frames when the directive is loaded, so it holds for
+any later ``set_dt``.
+
+A row is the state at its ``Time``: the first is written by ``run_ic``
+(the start state) and the next ones after every ``every``-th step.  The
+Python recorder reads right after the step instead, so its sample for
+time ``t`` is the state one ``dt`` later.
+"""
+import io
+import os
+from dataclasses import dataclass
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+TIME = 'Time'
+
+
+@dataclass(frozen=True)
+class NativeOutput:
+    """Properties JSBSim logs itself, one row every ``every`` steps."""
+    properties: tuple
+    every: int = 1
+
+    def directive(self, path, dt):
+        """``<output>`` text writing to ``path`` for an executor stepping at ``dt``."""
+        rate = 1.0 / (dt * self.every)
+        lines = [
+            '<?xml version="1.0"?>',
+            f'<output name={quoteattr(path)} type="CSV" rate="{rate!r}">',
+        ]
+        lines += [f'  <property>{escape(prop)}</property>' for prop in self.properties]
+        lines += ['</output>', '']
+        return '\n'.join(lines)
+
+
+def load_output(path, columns, rows=None, dtype=np.float64):
+    """``(columns + 1, rows)`` array of a CSV written by a ``NativeOutput``.
+
+    Row 0 is JSBSim's ``Time``.  ``rows`` keeps only the first ones (a
+    guard may have stopped the run part way into the file).
+    """
+    width = columns + 1
+    with open(path, 'rb') as f:
+        f.readline()  # 헤더 (Time, 속성 경로들)
+        body = f.read()
+    if not body.strip() or rows == 0:
+        return np.empty((width, 0), dtype=dtype)
+    # numpy 의 C 파서가 파일 전체를 한 번에 읽는다
+    values = np.loadtxt(io.BytesIO(body), dtype=np.float64, delimiter=',', ndmin=2,
+                        max_rows=rows)
+    return np.ascontiguousarray(values.T, dtype=dtype)
+
+
+def output_index(fdm):
+    """Index the next ``set_output_directive`` gets (models may bring their own)."""
+    index = 0
+    while fdm.get_output_filename(index):
+        index += 1
+    return index
+
+
+def discard(path):
+    if path and os.path.exists(path):
+        os.unlink(path)
@@ -0,0 +1,115 @@
+"""Offscreen plotting as a separate stage after the simulation.
+
+Generators save each trajectory with ``save_trajectory`` and describe the
+figure as a ``PlotJob``; ``render`` then draws the jobs in a process pool.
+Figures are plain Agg ``Figure`` objects (pyplot and its global state are
+never touched), one per ``Layout`` and worker, cleared and reused for
+every file.  Trajectories are decimated to ``max_points`` samples before
+drawing, which is all a PNG can show anyway.
+"""
+import os
+from dataclasses import dataclass
+from itertools import repeat
+
+import numpy as np
+
+MAX_POINTS = 2000
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Figure geometry: ``rows`` stacked axes, optionally 3D."""
+    figsize: tuple = (10, 8)
+    rows: int = 1
+    projection: str = None
+
+
+@dataclass(frozen=True)
+class PlotJob:
+    """Render ``source`` (a saved trajectory) to ``filename``.
+
+    ``draw(ax, data, title)`` is a module-level function; ``ax`` is the
+    single axes, or the list of axes for multi-row layouts.
+    """
+    draw: object
+    source: str
+    filename: str
+    title: str = ''
+    layout: Layout = Layout()
+    tight: bool = False
+
+
+def save_trajectory(path, data):
+    """Save a ``{name: array}`` trajectory as an uncompressed ``.npz``."""
+    np.savez(path, **{name: np.asarray(values) for name, values in data.items()})
+    return path
+
+
+def load_trajectory(path):
+    with np.load(path) as f:
+        return {name: f[name] for name in f.files}
+
+
+def decimate(data, max_points=MAX_POINTS):
+    """Stride every time series down to at most ``max_points`` (+ the last sample)."""
+    lengths = {len(v) for v in data.values() if np.ndim(v) >= 1}
+    if not lengths or not max_points:
+        return data
+    n = max(lengths)
+    stride = -(-n // max_points)
+    if stride <= 1:
+        return data
+    index = np.r_[np.arange(0, n, stride), n - 1] if (n - 1) % stride else np.arange(0, n, stride)
+    return {name: v[index] if np.ndim(v) >= 1 and len(v) == n else v
+            for name, v in data.items()}
+
+
+_figures = {}
+
+
+def _figure(layout):
+    cached = _figures.get(layout)
+    if cached is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=layout.figsize)
+        FigureCanvasAgg(fig)
+        axes = [fig.add_subplot(layout.rows, 1, k + 1, projection=layout.projection)
+                for k in range(layout.rows)]
+        cached = _figures[layout] = (fig, axes)
+    fig, axes = cached
+    # draw 가 더한 축 (twinx, 컬러바 등) 은 지우고 레이아웃의 축만 비워서 다시 쓴다
+    for ax in fig.axes:
+        if ax not in axes:
+            ax.remove()
+    for ax in axes:
+        ax.cla()
+    return fig, axes
+
+
+def render_one(job, max_points=MAX_POINTS):
+    fig, axes = _figure(job.layout)
+    data = decimate(load_trajectory(job.source), max_points)
+    job.draw(axes[0] if len(axes) == 1 else axes, data, job.title)
+    if job.tight:
+        fig.tight_layout()
+    fig.savefig(job.filename)
+    return job.filename
+
+
+def render(jobs, workers=None, max_points=MAX_POINTS, skip=False):
+    """Render all ``jobs``; returns the written filenames in job order.
+
+    ``skip=True`` renders nothing, so bulk runs keep the saved
+    trajectories and can plot them later.
+    """
+    jobs = list(jobs)
+    if skip or not jobs:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        return [render_one(job, max_points) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(render_one, jobs, repeat(max_points),
+                             chunksize=-(-len(jobs) // workers)))
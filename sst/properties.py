@@ -0,0 +1,65 @@
+"""Resolved property handles for the simulation hot loop.
+
+``fdm.get_property_value('attitude/psi-rad')`` walks the property tree on
+every call.  Resolving the path once to its ``FGPropertyNode`` and keeping
+the node's bound getter/setter turns each access into a direct call.
+Unknown paths are created (value 0.0), which matches what
+``get_property_value`` returns for them.
+"""
+
+
+class PropertyCache:
+    """Per-executor cache of resolved property nodes."""
+
+    def __init__(self, fdm):
+        self._manager = fdm.get_property_manager()
+        self._nodes = {}
+
+    def node(self, path):
+        node = self._nodes.get(path)
+        if node is None:
+            node = self._manager.get_node(path, True)
+            self._nodes[path] = node
+        return node
+
+    def getter(self, path):
+        return self.node(path).get_double_value
+
+    def setter(self, path):
+        return self.node(path).set_double_value
+
+    def reader(self, paths):
+        return PropertyReader(self, paths)
+
+    def writer(self, paths):
+        return PropertyWriter(self, paths)
+
+
+class PropertyReader:
+    """Reads a fixed list of properties in one call."""
+
+    def __init__(self, cache, paths):
+        self.paths = tuple(paths)
+        self._getters = tuple(cache.getter(p) for p in self.paths)
+
+    def read(self):
+        return [get() for get in self._getters]
+
+    def read_into(self, out, offset=0):
+        for i, get in enumerate(self._getters, offset):
+            out[i] = get()
+        return out
+
+
+class PropertyWriter:
+    """Writes control commands by path through resolved nodes."""
+
+    def __init__(self, cache, paths):
+        self.paths = tuple(paths)
+        self._setters = {p: cache.setter(p) for p in self.paths}
+
+    def set(self, path, value):
+        self._setters[path](value)
+
+    def __getitem__(self, path):
+        return self._setters[path]
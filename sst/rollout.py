@@ -0,0 +1,321 @@
+"""Scenario specs and the shared single-aircraft rollout loop.
+
+``run_scenario`` returns the whole trajectory; ``iter_scenario`` yields it
+in fixed-size chunks while the simulation runs, so hour-long rollouts can
+be persisted incrementally in constant memory.  The last chunk carries a
+``'termination'`` entry: ``'completed'`` or the name of the guard that
+ended the run early (see ``sst.guards``).
+"""
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from itertools import repeat
+
+from sst import timing
+from sst.guards import Guard, GuardMonitor, Termination
+from sst.observation import schema_from_spec
+from sst.output import NativeOutput, load_output
+from sst.recorder import TrajectoryRecorder
+from sst.schedule import (CONTROL, GUARD, RECORD, ClosedLoopLogic, EventPlayer, compile_maneuvers,
+                          quantize_events, rate_steps, step_times, tick_plan, trace_logic)
+from sst.script import script_xml
+from sst.snapshot import default_store, restored
+
+DEFAULT_CHANNELS = {
+    'z': 'position/h-agl-ft',
+    'v': 'velocities/vc-kts',
+    'pitch': 'attitude/theta-deg',
+}
+
+# 조기 종료는 data['termination'] 으로 돌려주고, 자세한 내용은 로그로만 남긴다
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Scenario:
+    """Everything needed to fly one rollout.
+
+    ``maneuvers`` is either a list of ``(t, property, value)`` commands that
+    take effect once the sim time passes ``t``, or a ``logic(fdm, step)``
+    callback as used by the maneuver validators.  ``warmup`` seconds are
+    flown (engine untouched) before ``throttle`` starts the engine; the
+    settled state is shared through the snapshot store.  ``duration`` is
+    measured on the sim clock, so it includes the warmup.  With ``trim``
+    the rollout instead starts from JSBSim's level-flight trim at the
+    altitude and speed (``sst.trim``, cached with the store), so no warmup
+    is flown; a ``throttle`` still replaces the trimmed one.  With
+    ``script`` an open-loop schedule runs as a native JSBSim script
+    (``sst.script``) instead of being applied from Python.  An executor
+    takes one script for good, so every distinct schedule loads the
+    aircraft model again (about 8 ms for the F-16, more than a short
+    rollout saves); only re-flying the same scenario reuses a pooled
+    scripted executor.  With
+    ``native_output`` JSBSim logs the channels itself (``sst.output``) and
+    they are parsed after the run; each sample is then the state at its
+    ``t``, one step before the one the Python recorder reads.
+
+    ``channels`` is an observation schema spec (``sst.observation``): a
+    ``{name: path}`` dict, or per-channel ``unit``/``norm``/``dtype``
+    entries, converted once per chunk after the raw values are recorded.
+
+    Physics runs at ``1 / dt``.  Controls are applied at ``control_hz``
+    (schedule changes wait for the next control tick; ``None`` means every
+    physics step) and samples are recorded at ``record_hz`` (or every
+    ``decimation``-th step) as ``dtype``; both must divide the physics
+    rate.  Steps with nothing to do in Python are a bare ``fdm.run()``.
+
+    ``guards`` stop the run once a property leaves its range, checked
+    every ``guard_every`` steps (default: each control tick); ``floor`` is
+    shorthand for a ground guard given as a ``(property, value)`` pair.
+    """
+    name: str
+    altitude_ft: float
+    speed_kts: float
+    aircraft: str = 'f16'
+    ic: dict = field(default_factory=dict)
+    throttle: float = None
+    maneuvers: object = ()
+    duration: float = 20.0
+    dt: float = 1.0/120.0
+    warmup: float = 0.0
+    trim: bool = False
+    script: bool = False
+    native_output: bool = False
+    channels: dict = field(default_factory=lambda: dict(DEFAULT_CHANNELS))
+    floor: tuple = None
+    guards: tuple = ()
+    guard_every: int = None
+    decimation: int = 1
+    control_hz: float = None
+    record_hz: float = None
+    dtype: str = 'float64'
+
+    def record_every(self):
+        return rate_steps(self.dt, self.record_hz) if self.record_hz else self.decimation
+
+    def all_guards(self):
+        guards = list(self.guards)
+        if self.floor:
+            guards.insert(0, Guard('ground', self.floor[0], low=self.floor[1]))
+        return guards
+
+
+def run_scenario(scenario, store=None):
+    """Fly ``scenario`` and return ``{'t': ..., <channel>: ...}`` arrays.
+
+    ``'termination'`` holds why the run ended (``'completed'`` if it ran
+    the full duration).
+    """
+    for data in iter_scenario(scenario, None, store):
+        return data
+
+
+def iter_scenario(scenario, chunk=1000, store=None):
+    """Fly ``scenario``, yielding ``{'t': ..., <channel>: ...}`` chunks.
+
+    Each chunk holds ``chunk`` recorded samples (the last one may be
+    shorter, and is empty if nothing was recorded before a guard stopped
+    the run).  The simulation only advances when the next chunk is
+    requested, which paces it to the consumer.  The arrays are views into
+    a buffer that is reused for the next chunk: persist or copy them
+    before asking for more.  ``chunk=None`` yields the whole trajectory
+    as a single chunk.
+    """
+    store = store or default_store()
+    profile = timing.start(scenario.name)
+    output = native_output(scenario)
+    with profile.section('trim') if profile is not None else nullcontext():
+        start = start_fdm(scenario, store, output)
+    with start as fdm:
+        path = store.pool.output_path(fdm) if output is not None else None
+        yield from _fly(fdm, store.pool.properties(fdm), scenario, chunk, profile, path)
+
+
+def start_fdm(scenario, store, output=None):
+    """Context manager lending a pooled executor at the scenario's start state.
+
+    That is the trim point with ``scenario.trim``, otherwise the IC
+    settled for ``warmup`` seconds (both cached in ``store``).  With
+    ``scenario.script`` the executor also carries the schedule as a
+    JSBSim script; ``output`` is a ``NativeOutput`` for it to log.
+    """
+    start, open_fdm = _start_state(scenario, store)
+    script = _script(scenario, start) if scenario.script else None
+    return open_fdm(script, output)
+
+
+def native_output(scenario):
+    """The ``NativeOutput`` logging ``scenario``'s channels, or ``None``."""
+    if not scenario.native_output:
+        return None
+    schema = schema_from_spec(scenario.channels)
+    return NativeOutput(tuple(schema.paths), scenario.record_every())
+
+
+def scenario_script(scenario, store):
+    """The JSBSim script text for ``scenario``, or ``None`` for closed-loop logic."""
+    start, _ = _start_state(scenario, store)
+    return _script(scenario, start)
+
+
+def _start_state(scenario, store):
+    # (시작 sim 시간, (script, output) -> 컨텍스트 매니저)
+    if scenario.trim:
+        point = store.trims.get(scenario.aircraft, scenario.altitude_ft, scenario.speed_kts)
+        return 0.0, lambda script, output: store.trims.restored(point, scenario.ic, scenario.dt,
+                                                                script, output)
+    trim = store.trim_point(scenario.aircraft, scenario.altitude_ft, scenario.speed_kts,
+                            settle_time=scenario.warmup, dt=scenario.dt, ic=scenario.ic)
+    return trim.sim_time, lambda script, output: restored(trim, store.pool, script, output)
+
+
+def _script(scenario, start):
+    steps, times, logic, events, _ = plan_schedule(scenario, start, scenario.dt)
+    if logic is not None:
+        return None
+    return script_xml(scenario.name, scenario.aircraft, events, times, scenario.dt)
+
+
+def plan_schedule(scenario, start, dt):
+    """``(steps, times, logic, events, control_every)`` of a rollout starting at ``start``.
+
+    ``events`` are the compiled, control-tick quantized commands;
+    ``logic`` is the callback when it reads FDM state and has to run in
+    the loop (``events`` is then empty).
+    """
+    steps = int(round((scenario.duration - start) / scenario.dt))
+    times = step_times(start, dt, steps)
+
+    # 기동 스케줄은 명령이 바뀌는 스텝에만 쓰도록 미리 컴파일한다
+    logic = None
+    if callable(scenario.maneuvers):
+        try:
+            events = trace_logic(scenario.maneuvers, steps)
+        except ClosedLoopLogic:
+            logic, events = scenario.maneuvers, []
+    else:
+        events = compile_maneuvers(scenario.maneuvers, times)
+    control_every = rate_steps(scenario.dt, scenario.control_hz)
+    return steps, times, logic, quantize_events(events, control_every), control_every
+
+
+def _fly(fdm, props, scenario, chunk=None, profile=None, output_path=None):
+    if scenario.throttle is not None:
+        props.setter('propulsion/engine[0]/set-running')(1)
+        props.setter('fcs/throttle-cmd-norm')(scenario.throttle)
+
+    schema = schema_from_spec(scenario.channels)
+    reader = schema.reader(props)
+    guards = scenario.all_guards()
+    check = GuardMonitor(guards, props).check if guards else None
+    termination = Termination()
+    run = fdm.run
+
+    steps, times, logic, events, control_every = plan_schedule(
+        scenario, fdm.get_sim_time(), fdm.get_delta_t())
+    if scenario.script and logic is None:
+        # JSBSim 스크립트가 명령을 넣으므로 파이썬은 기록/가드 틱만 돈다
+        events = []
+    player = EventPlayer(events, props)
+
+    # 파이썬이 할 일이 있는 스텝만 골라 두고, 나머지는 run()만 돈다
+    # (JSBSim 이 직접 기록하면 기록 틱도 없다)
+    decimation = scenario.record_every()
+    ticks, flags = tick_plan(steps, [step for step, _, _ in events],
+                             control_every if logic is not None else None,
+                             (scenario.guard_every or control_every) if check else None,
+                             decimation if output_path is None else None)
+    capacity = chunk * decimation if chunk else steps
+    # 단위 변환/정규화가 있으면 원시값을 float64 로 모았다가 청크마다 한 번에 바꾼다
+    raw_dtype = schema.raw_dtype(scenario.dtype)
+    recorder = TrajectoryRecorder(['t'] + schema.names, capacity, decimation, raw_dtype)
+    play, slot, read_into = player.play, recorder.slot, reader.read_into
+
+    # 프로파일링이 꺼져 있으면 루프는 그대로, 켜져 있으면 구간별로 감싼다
+    loop = None
+    if profile is not None:
+        run = profile.wrap('run', run)
+        play = profile.wrap('control', play)
+        logic = logic and profile.wrap('control', logic)
+        check = check and profile.wrap('guards', check)
+        slot = profile.wrap('record', slot)
+        read_into = profile.wrap('read', read_into)
+        loop = profile.stopwatch(timing.LOOP)
+        loop.start()
+
+    times = times.tolist()
+    done = 0
+    stop = steps
+    for i, flag in zip(ticks, flags):
+        for _ in repeat(None, i - done):
+            run()
+        done = i + 1
+
+        if flag & CONTROL:
+            if logic is not None:
+                logic(fdm, i)
+            else:
+                play(i)
+
+        run()
+
+        if flag & GUARD:
+            violation = check()
+            if violation is not None:
+                termination = GuardMonitor.termination(violation, fdm.get_sim_time())
+                log.info("[%s] terminated, %s", scenario.name, termination)
+                stop = i
+                break
+
+        if flag & RECORD:
+            if recorder.full():
+                if loop is not None:
+                    loop.stop()
+                yield _columns(recorder.buffer[:, :len(recorder)], schema, scenario.dtype)
+                if loop is not None:
+                    loop.start()
+                recorder.clear()
+            row = slot()
+            row[0] = times[i]
+            read_into(row, 1)
+    else:
+        for _ in repeat(None, steps - done):
+            run()
+
+    if loop is not None:
+        loop.stop()
+    if output_path is not None:
+        # 파이썬 기록기가 남겼을 만큼의 행 (기록 틱 < stop), 시각은 같은 step_times 로
+        with profile.section('load') if profile is not None else nullcontext():
+            rows = load_output(output_path, len(schema), -(-stop // decimation), raw_dtype)
+            rows[0] = times[:stop:decimation]
+    if loop is not None:
+        loop.done()
+        timing.collect([profile])
+    if output_path is not None:
+        yield from _chunks(rows, schema, scenario.dtype, chunk, termination)
+    else:
+        # 기록이 하나도 없어도 (첫 기록 틱 전에 가드가 멈춤) termination 은 돌려준다
+        data = _columns(recorder.buffer[:, :len(recorder)], schema, scenario.dtype)
+        data['termination'] = termination.reason
+        yield data
+
+
+def _columns(rows, schema, dtype):
+    # 0행은 시각, 나머지는 스키마 채널 (원시값 -> 단위/정규화/타입)
+    data = {'t': rows[0].astype(dtype, copy=False)}
+    data.update(schema.columns(rows[1:], dtype))
+    return data
+
+
+def _chunks(rows, schema, dtype, chunk, termination):
+    # 기록기와 같은 모양으로 나눠 준다: 꽉 찬 청크들, 마지막 청크에 termination
+    # (행이 없으면 빈 청크 하나)
+    count = rows.shape[1]
+    starts = range(0, count, chunk) if chunk and count else [0]
+    for n, at in enumerate(starts):
+        end = at + chunk if chunk else count
+        data = _columns(rows[:, at:end], schema, dtype)
+        if n == len(starts) - 1:
+            data['termination'] = termination.reason
+        yield data
@@ -0,0 +1,152 @@
+"""Maneuver schedules compiled into sparse control events.
+
+The scripts describe maneuvers either as ``(t, property, value)`` tuples
+that are re-applied on every step once ``t`` has passed, or as
+``logic(fdm, step)`` callbacks that re-set the same commands every step.
+Both boil down to a handful of command changes per run; compiling them
+into a sorted event list means the hot loop only writes a property on the
+step where its command actually changes.
+"""
+import numpy as np
+
+# tick_plan 플래그
+CONTROL, GUARD, RECORD = 1, 2, 4
+
+
+class ClosedLoopLogic(Exception):
+    """Raised when a logic callback reads FDM state and cannot be traced."""
+
+
+def step_times(start_time, dt, steps):
+    """Sim time at the start of each step, accumulated like JSBSim does."""
+    if steps <= 0:
+        return np.empty(0)
+    increments = np.full(steps, dt)
+    increments[0] = start_time
+    return np.cumsum(increments)
+
+
+def compile_maneuvers(maneuvers, times):
+    """Turn ``(t, property, value)`` tuples into ``(step, property, value)`` events.
+
+    Matches the per-step scan: on each step every entry with ``t`` already
+    passed is applied in list order, so the last such entry per property
+    wins.  Only steps where that winning value changes produce an event.
+    """
+    effective = {}
+    for m_t, m_cmd, m_val in maneuvers:
+        current = effective.get(m_cmd)
+        if current is None:
+            current = np.full(len(times), np.nan)
+        effective[m_cmd] = np.where(times > m_t, m_val, current)
+
+    events = []
+    for order, (path, values) in enumerate(effective.items()):
+        previous = np.r_[np.nan, values[:-1]]
+        changed = ~np.isnan(values) & ~(values == previous)
+        for step in np.flatnonzero(changed):
+            events.append((int(step), order, path, float(values[step])))
+    events.sort()
+    return [(step, path, value) for step, _, path, value in events]
+
+
+class _Tracer:
+    def __init__(self):
+        self.last = {}
+        self.events = []
+        self.step = 0
+
+    def set_property_value(self, path, value):
+        if self.last.get(path) != value:
+            self.last[path] = value
+            self.events.append((self.step, path, float(value)))
+
+    def get_property_value(self, path):
+        raise ClosedLoopLogic(f"logic reads '{path}'; it must run per step")
+
+
+def trace_logic(logic, steps):
+    """Record the commands an open-loop ``logic(fdm, step)`` callback issues.
+
+    Raises ``ClosedLoopLogic`` if the callback reads any FDM state.
+    """
+    tracer = _Tracer()
+    for step in range(steps):
+        tracer.step = step
+        logic(tracer, step)
+    return tracer.events
+
+
+def control_array(events, steps, paths, initial=0.0):
+    """Per-step command matrix ``(steps, len(paths))`` for the given events."""
+    column = {path: j for j, path in enumerate(paths)}
+    out = np.full((steps, len(paths)), np.nan)
+    out[0] = initial
+    for step, path, value in events:
+        if path in column and step < steps:
+            out[step, column[path]] = value
+    # forward fill along time
+    idx = np.where(np.isnan(out), 0, np.arange(steps)[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return out[idx, np.arange(len(paths))]
+
+
+def rate_steps(dt, hz):
+    """Physics steps per tick of a ``hz`` rate (``None``: every step).
+
+    The rate has to divide the physics rate ``1 / dt``.
+    """
+    if not hz:
+        return 1
+    n = int(round(1.0 / (hz * dt)))
+    if n < 1 or abs(n * hz * dt - 1.0) > 1e-6:
+        raise ValueError(f"{hz:g} Hz does not divide the {1.0 / dt:g} Hz physics rate")
+    return n
+
+
+def quantize_events(events, every):
+    """Delay each ``(step, property, value)`` event to the next multiple of ``every``."""
+    if every == 1:
+        return list(events)
+    return [(-(-step // every) * every, path, value) for step, path, value in events]
+
+
+def tick_plan(steps, event_steps=(), control_every=None, guard_every=None, record_every=None):
+    """Steps that need Python work, and which work, as two lists.
+
+    Returns ``(ticks, flags)`` where ``flags`` combines ``CONTROL`` (an
+    event step, or every ``control_every``-th step for closed-loop logic),
+    ``GUARD`` and ``RECORD``.  Every other step is a bare ``fdm.run()``.
+    """
+    flags = np.zeros(steps, dtype=np.uint8)
+    event_steps = np.asarray(event_steps, dtype=int)
+    flags[event_steps[event_steps < steps]] |= CONTROL
+    for flag, every in ((CONTROL, control_every), (GUARD, guard_every), (RECORD, record_every)):
+        if every:
+            flags[::every] |= flag
+    ticks = np.flatnonzero(flags)
+    return ticks.tolist(), flags[ticks].tolist()
+
+
+class EventPlayer:
+    """Applies compiled events through resolved property setters.
+
+    ``next_step`` is the only thing the loop needs to compare against::
+
+        if i == player.next_step:
+            player.play(i)
+    """
+
+    def __init__(self, events, props):
+        self._events = [(step, props.setter(path), value) for step, path, value in events]
+        self._index = 0
+        self.next_step = self._events[0][0] if self._events else -1
+
+    def play(self, step):
+        events = self._events
+        index = self._index
+        while index < len(events) and events[index][0] == step:
+            events[index][1](events[index][2])
+            index += 1
+        self._index = index
+        self.next_step = events[index][0] if index < len(events) else -1
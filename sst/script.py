@@ -0,0 +1,68 @@
+"""Maneuver schedules as native JSBSim scripts.
+
+``script_xml`` turns compiled ``(step, property, value)`` events (see
+``sst.schedule``) into a ``<runscript>`` whose events JSBSim fires itself
+inside ``FGFDMExec::Run``, before the models of that step run, exactly
+where the Python ``EventPlayer`` would have set them.  The script sees the
+sim clock already advanced to the end of the step, so each event's
+condition sits half a step past the step's start time; the clock can
+then accumulate differently from ``step_times`` and still hit the same
+step.
+
+The script is loaded by ``FDMPool.acquire(..., script=xml)`` into a fresh,
+single-use executor (JSBSim cannot load a second script into an
+executor), which is then reset to the scenario's start state like any
+pooled one.  ``Scenario(script=True)`` flies that way; only record and
+guard ticks are left for Python.
+"""
+from xml.sax.saxutils import quoteattr
+
+from sst.core import LOAD_DT
+
+SIM_TIME = 'simulation/sim-time-sec'
+
+
+def script_xml(name, aircraft, events, times, dt, end_time=None):
+    """``<runscript>`` text applying ``events`` at their steps of ``times``.
+
+    ``end_time`` only bounds the script; the rollout decides how many
+    steps are run (default: one step past the last of ``times``).  The
+    script's own ``dt`` is ``LOAD_DT``, the step the model is loaded at;
+    the pool sets the rollout's ``dt`` afterwards, as for any executor.
+    """
+    dt = float(dt)
+    start_time = float(times[0]) if len(times) else 0.0
+    if end_time is None:
+        end_time = (float(times[-1]) if len(times) else start_time) + dt
+    lines = [
+        '<?xml version="1.0"?>',
+        f'<runscript name={quoteattr(name)}>',
+        f'  <use aircraft={quoteattr(aircraft)} initialize="reset00"/>',
+        f'  <run start="{start_time!r}" end="{end_time!r}" dt="{LOAD_DT!r}">',
+    ]
+    # 같은 스텝의 명령은 한 이벤트로 묶는다 (목록 순서대로 적용된다)
+    grouped = {}
+    for step, path, value in events:
+        grouped.setdefault(step, []).append((path, value))
+    for step, sets in grouped.items():
+        # 스크립트가 보는 sim 시간은 이미 그 스텝의 끝 시각이다
+        threshold = float(times[step]) + 0.5 * dt
+        lines.append(f'    <event name="step {step}">')
+        lines.append(f'      <condition>{SIM_TIME} ge {threshold!r}</condition>')
+        for path, value in sets:
+            lines.append(f'      <set name={quoteattr(path)} value="{float(value)!r}"/>')
+        lines.append('    </event>')
+    lines += ['  </run>', '</runscript>', '']
+    return '\n'.join(lines)
+
+
+def save_script(path, scenario, store=None):
+    """Write the JSBSim script ``Scenario(script=True)`` would run for ``scenario``."""
+    from sst.rollout import scenario_script
+    from sst.snapshot import default_store
+    xml = scenario_script(scenario, store or default_store())
+    if xml is None:
+        raise ValueError(f"'{scenario.name}' reads FDM state in its logic; it cannot be scripted")
+    with open(path, 'w') as f:
+        f.write(xml)
+    return path
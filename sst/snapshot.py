@@ -0,0 +1,161 @@
+"""Post-stabilization state snapshots keyed by trim point.
+
+The scripts spin the model for a while after ``run_ic`` (10-100 warmup
+steps, 5 s of "pre-run") before the maneuver starts.  A snapshot records
+the settled state once as IC values so any pooled executor can start
+from it directly.
+
+Only the rigid-body state and the control commands are carried over;
+FCS filters and engine internals start as they do after ``run_ic``.  In
+particular ``set-running`` issued right after a restore really starts the
+engine, whereas issuing it mid-flight (as the generators used to after
+their warmup) left the F-16 windmilling with no thrust.
+"""
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from sst.core import default_pool
+from sst.trim import TrimTable
+
+# (상태 속성, 대응되는 IC 속성) - 자세를 먼저 넣어야 body 속도가 올바르게 들어간다
+STATE_TO_IC = (
+    ('position/lat-geod-deg', 'ic/lat-geod-deg'),
+    ('position/long-gc-deg', 'ic/long-gc-deg'),
+    ('position/h-sl-ft', 'ic/h-sl-ft'),
+    ('attitude/phi-deg', 'ic/phi-deg'),
+    ('attitude/theta-deg', 'ic/theta-deg'),
+    ('attitude/psi-deg', 'ic/psi-true-deg'),
+    ('velocities/u-fps', 'ic/u-fps'),
+    ('velocities/v-fps', 'ic/v-fps'),
+    ('velocities/w-fps', 'ic/w-fps'),
+    ('velocities/p-rad_sec', 'ic/p-rad_sec'),
+    ('velocities/q-rad_sec', 'ic/q-rad_sec'),
+    ('velocities/r-rad_sec', 'ic/r-rad_sec'),
+)
+
+CONTROLS = (
+    'propulsion/engine[0]/set-running',
+    'fcs/throttle-cmd-norm',
+    'fcs/mixture-cmd-norm',
+    'fcs/elevator-cmd-norm',
+    'fcs/aileron-cmd-norm',
+    'fcs/rudder-cmd-norm',
+)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    aircraft: str
+    dt: float
+    sim_time: float
+    values: tuple
+
+    def ic(self):
+        return dict(self.values)
+
+
+def capture(fdm, aircraft):
+    values = [(name, fdm.get_property_value(name)) for name in CONTROLS]
+    values += [(ic, fdm.get_property_value(prop)) for prop, ic in STATE_TO_IC]
+    return Snapshot(aircraft, fdm.get_delta_t(), fdm.get_sim_time(), tuple(values))
+
+
+def restore(snapshot, pool=None, script=None, output=None):
+    pool = pool or default_pool()
+    fdm = pool.acquire(snapshot.aircraft, snapshot.ic(), dt=snapshot.dt, script=script,
+                       output=output)
+    fdm.set_sim_time(snapshot.sim_time)
+    return fdm
+
+
+@contextmanager
+def restored(snapshot, pool=None, script=None, output=None):
+    pool = pool or default_pool()
+    fdm = restore(snapshot, pool, script, output)
+    try:
+        yield fdm
+    finally:
+        pool.release(fdm)
+
+
+def trim_path(path):
+    """Where a store at ``path`` keeps its ``TrimTable`` (``x.json`` -> ``x.trim.json``)."""
+    root, ext = os.path.splitext(path)
+    return f'{root}.trim{ext or ".json"}'
+
+
+def trim_key(aircraft, altitude_ft, speed_kts, throttle, settle_time, dt, ic):
+    extra = ','.join(f'{k}={v:g}' for k, v in sorted((ic or {}).items()))
+    return f'{aircraft}|{altitude_ft:g}|{speed_kts:g}|{throttle}|{settle_time:g}|{dt:.6g}|{extra}'
+
+
+class SnapshotStore:
+    """Settled states per (aircraft, altitude, speed, throttle) trim point.
+
+    Missing entries are computed by flying the IC for ``settle_time``
+    seconds.  ``throttle=None`` settles with the engine off, matching the
+    scripts that only start the engine after their warmup.  With ``path``
+    the store is kept as JSON so later runs skip the settling entirely;
+    ``readonly`` stores load the file but never write it back.  ``trims``
+    is the matching ``sst.trim.TrimTable`` for scenarios that start from
+    JSBSim's trim instead of a settled state.
+    """
+
+    def __init__(self, path=None, pool=None, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self.pool = pool or default_pool()
+        self._snapshots = {}
+        self.trims = TrimTable(trim_path(path) if path else None, self.pool, readonly)
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for key, entry in json.load(f).items():
+                    values = tuple((name, value) for name, value in entry['values'])
+                    self._snapshots[key] = Snapshot(entry['aircraft'], entry['dt'],
+                                                    entry['sim_time'], values)
+
+    def trim_point(self, aircraft, altitude_ft, speed_kts, throttle=None,
+                   settle_time=5.0, dt=1.0/120.0, ic=None):
+        key = trim_key(aircraft, altitude_ft, speed_kts, throttle, settle_time, dt, ic)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._settle(aircraft, altitude_ft, speed_kts, throttle,
+                                    settle_time, dt, ic)
+            self._snapshots[key] = snapshot
+            if self.path and not self.readonly:
+                self.save()
+        return snapshot
+
+    def _settle(self, aircraft, altitude_ft, speed_kts, throttle, settle_time, dt, ic):
+        values = {'ic/h-agl-ft': altitude_ft, 'ic/vc-kts': speed_kts}
+        values.update(ic or {})
+        if throttle is not None:
+            values['propulsion/engine[0]/set-running'] = 1
+            values['fcs/throttle-cmd-norm'] = throttle
+        with self.pool.borrow(aircraft, values, dt=dt) as fdm:
+            for _ in range(int(round(settle_time / dt))):
+                fdm.run()
+            return capture(fdm, aircraft)
+
+    def save(self):
+        entries = {
+            key: {'aircraft': s.aircraft, 'dt': s.dt, 'sim_time': s.sim_time,
+                  'values': [list(v) for v in s.values]}
+            for key, s in self._snapshots.items()
+        }
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+_default_store = None
+
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = SnapshotStore()
+    return _default_store
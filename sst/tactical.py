@@ -0,0 +1,306 @@
+"""Seeded random tactical episodes for world-model training data.
+
+An episode is the F-16 flying from the 20,000 ft / 450 kt trim point
+while elevator and aileron chase random targets that change every 3 s,
+smoothed by ``curr += (target - curr) * 0.05`` each step.  Episode
+``index`` of a run with base ``seed`` draws from its own NumPy
+``Generator`` (``SeedSequence(seed, spawn_key=(index,))``), so any single
+episode can be regenerated on demand and results do not depend on how
+episodes are spread over workers.
+
+Both command sequences are computed as arrays before the run.  The only
+closed-loop part is the safety pull-up: when altitude drops below
+5,000 ft the elevator target is forced to -0.8 until the next target
+change, and just the remainder of the elevator array is re-smoothed.
+Episodes that still leave the flight envelope (``sst.guards.envelope``)
+end early, with the reason in ``'termination'``.
+
+``run_branched_episode`` adds counterfactual continuations: at chosen
+target changes it forks the run (``sst.branching``) and flies each
+branch on with freshly drawn targets, so the shared prefix is flown once.
+"""
+from contextlib import nullcontext
+
+import numpy as np
+
+from sst import timing
+from sst.batch import iter_batch
+from sst.branching import Checkpoint, can_fork, fork_map
+from sst.guards import GuardMonitor, Termination, envelope
+from sst.observation import schema_from_spec
+from sst.recorder import TrajectoryRecorder
+from sst.snapshot import default_store, restored
+
+SCHEMA = schema_from_spec(['alt', 'pitch', 'roll', 'vel', 'gload', 'elevator', 'aileron'])
+CHANNELS = dict(zip(SCHEMA.names, SCHEMA.paths))
+STATE = ['alt', 'pitch', 'roll', 'vel', 'gload']
+ACTION = ['elevator', 'aileron']
+
+TRIM_IC = {'ic/theta-deg': 0.0, 'ic/alpha-deg': 2.0, 'fcs/mixture-cmd-norm': 1.0}
+THROTTLE = 0.9
+HOLD_SEC = 3.0
+SMOOTHING = 0.05
+ELEVATOR_RANGE = (-0.5, 0.2)  # -0.5는 꽤 강하게 당기는 기동
+AILERON_RANGE = (-0.4, 0.4)
+PULL_UP_ALT = 5000.0
+PULL_UP_ELEVATOR = -0.8
+DECIMATION = 10
+GUARDS = envelope()
+
+
+def episode_rng(seed, index):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+def smooth(targets, alpha=SMOOTHING, initial=0.0):
+    """Exponential smoothing of a piecewise-constant target sequence.
+
+    Equivalent to ``curr += (target - curr) * alpha`` per step, evaluated
+    in closed form over each constant stretch.
+    """
+    targets = np.asarray(targets, dtype=float)
+    out = np.empty_like(targets)
+    starts = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+    ends = np.r_[starts[1:], len(targets)]
+    current = initial
+    for start, end in zip(starts, ends):
+        target = targets[start]
+        decay = (1.0 - alpha) ** np.arange(1, end - start + 1)
+        out[start:end] = target + (current - target) * decay
+        current = out[end - 1]
+    return out
+
+
+def episode_controls(rng, steps, dt, initial=(0.0, 0.0)):
+    """Target and smoothed elevator/aileron arrays for one episode.
+
+    ``initial`` is the (elevator, aileron) command the smoothing starts from.
+    """
+    hold = int(HOLD_SEC / dt)
+    blocks = -(-steps // hold)
+    elevator_target = np.repeat(rng.uniform(*ELEVATOR_RANGE, blocks), hold)[:steps]
+    aileron_target = np.repeat(rng.uniform(*AILERON_RANGE, blocks), hold)[:steps]
+    return {
+        'elevator_target': elevator_target,
+        'aileron_target': aileron_target,
+        'elevator': smooth(elevator_target, initial=initial[0]),
+        'aileron': smooth(aileron_target, initial=initial[1]),
+    }
+
+
+def start_state(store, dt=0.01):
+    """The settled 20,000 ft / 450 kt snapshot every episode starts from."""
+    return store.trim_point('f16', 20000.0, 450.0, throttle=0.8, settle_time=5.0, dt=dt,
+                            ic=TRIM_IC)
+
+
+class _Episode:
+    """An episode's executor, command arrays and recorder, flown in segments."""
+
+    def __init__(self, fdm, props, controls, steps, dt, profile=None):
+        self.fdm = fdm
+        self.steps = steps
+        self.dt = dt
+        self.hold = int(HOLD_SEC / dt)
+        self.elevator_target = controls['elevator_target']
+        self.aileron_target = controls['aileron_target']
+        self.elevator = controls['elevator']
+        self.aileron = controls['aileron']
+        self.set_el = props.setter('fcs/elevator-cmd-norm')
+        self.set_ai = props.setter('fcs/aileron-cmd-norm')
+        self.get_alt = props.getter('position/h-agl-ft')
+        self.read_into = SCHEMA.reader(props).read_into
+        self.check = GuardMonitor(GUARDS, props).check
+        self.termination = Termination()
+        props.setter('fcs/throttle-cmd-norm')(THROTTLE)
+        self.run = fdm.run
+
+        self.recorder = TrajectoryRecorder(['time'] + list(CHANNELS), steps, decimation=DECIMATION)
+        self.slot = self.recorder.slot
+        if profile is not None:
+            self.set_el = profile.wrap('control', self.set_el)
+            self.set_ai = profile.wrap('control', self.set_ai)
+            self.get_alt = profile.wrap('control', self.get_alt)
+            self.run = profile.wrap('run', self.run)
+            self.check = profile.wrap('guards', self.check)
+            self.slot = profile.wrap('record', self.slot)
+            self.read_into = profile.wrap('read', self.read_into)
+
+    def redraw(self, step, rng):
+        """Replace the commands from ``step`` (a target change) on with new draws."""
+        controls = episode_controls(rng, self.steps - step, self.dt,
+                                    (self.elevator[step - 1], self.aileron[step - 1]))
+        for name in ('elevator_target', 'aileron_target', 'elevator', 'aileron'):
+            getattr(self, name)[step:] = controls[name]
+
+    def fly(self, start, stop):
+        """Steps ``start:stop``; ``False`` once a guard has ended the episode."""
+        set_el, set_ai, get_alt, run = self.set_el, self.set_ai, self.get_alt, self.run
+        check, slot, read_into = self.check, self.slot, self.read_into
+        steps, hold, dt = self.steps, self.hold, self.dt
+        elevator_target, elevator = self.elevator_target, self.elevator
+        elevator_cmd = elevator.tolist()
+        aileron = self.aileron.tolist()
+
+        for i in range(start, stop):
+            set_el(elevator_cmd[i])
+            set_ai(aileron[i])
+            run()
+
+            # 고도가 너무 낮아지면 다음 목표 변경까지 강제로 기수 올리기 (Safety)
+            if get_alt() < PULL_UP_ALT:
+                block_end = min((i // hold + 1) * hold, steps)
+                if i + 1 < block_end and elevator_target[i + 1] != PULL_UP_ELEVATOR:
+                    elevator_target[i + 1:block_end] = PULL_UP_ELEVATOR
+                    elevator[i + 1:] = smooth(elevator_target[i + 1:], initial=elevator[i])
+                    elevator_cmd = elevator.tolist()
+
+            violation = check()
+            if violation is not None:
+                self.termination = GuardMonitor.termination(violation, self.fdm.get_sim_time())
+                return False
+
+            if i % DECIMATION == 0:
+                row = slot()
+                row[0] = i * dt
+                read_into(row, 1)
+        return True
+
+    def data(self, first_row=0, copy=False):
+        data = {name: values[first_row:].copy() if copy else values[first_row:]
+                for name, values in self.recorder.columns().items()}
+        data['termination'] = self.termination.reason
+        return data
+
+
+def run_episode(seed, index=0, duration_sec=60, dt=0.01, store=None):
+    """Fly one seeded episode; returns ``{'time': ..., <channel>: ...}`` at 10 Hz."""
+    store = store or default_store()
+    steps = int(duration_sec / dt)
+    controls = episode_controls(episode_rng(seed, index), steps, dt)
+
+    profile = timing.start('tactical_random')
+    with profile.section('trim') if profile is not None else nullcontext():
+        trim = start_state(store, dt)
+    with restored(trim, store.pool) as fdm:
+        episode = _Episode(fdm, store.pool.properties(fdm), controls, steps, dt, profile)
+        if profile is not None:
+            loop = profile.stopwatch(timing.LOOP)
+            loop.start()
+        episode.fly(0, steps)
+        if profile is not None:
+            loop.stop()
+            loop.done()
+            timing.collect([profile])
+        return episode.data()
+
+
+def branch_rng(seed, index, step, branch):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index, step, branch)))
+
+
+def decision_steps(duration_sec=60, dt=0.01, count=None):
+    """``count`` target-change steps spread evenly over the episode (default: all)."""
+    hold = int(HOLD_SEC / dt)
+    changes = np.arange(hold, int(duration_sec / dt), hold)
+    if count is None or count >= len(changes):
+        return changes.tolist()
+    return changes[np.linspace(0, len(changes) - 1, count).round().astype(int)].tolist()
+
+
+def run_branched_episode(seed, index=0, branches=10, decisions=6, horizon=None, duration_sec=60,
+                         dt=0.01, workers=1, fork=None, store=None):
+    """Episode ``index`` plus ``branches`` counterfactual continuations per decision point.
+
+    At each of ``decisions`` target changes (``decision_steps``) the
+    episode is checkpointed and every branch redraws the remaining
+    targets from ``branch_rng(seed, index, step, k)`` and flies on for
+    ``horizon`` seconds (default: to the end of the episode); the trunk
+    itself continues with the episode's own draws, so it equals
+    ``run_episode``.  Branches fork the process (``sst.branching``;
+    ``workers`` at a time) and continue bit-identically, or with
+    ``fork=False`` restore an in-process ``Checkpoint``.
+
+    Returns ``(trunk, [(decision_time, k, data), ...])``; a branch's data
+    starts at its decision point.
+    """
+    store = store or default_store()
+    steps = int(duration_sec / dt)
+    horizon_steps = steps if horizon is None else int(round(horizon / dt))
+    fork = can_fork() if fork is None else fork
+    controls = episode_controls(episode_rng(seed, index), steps, dt)
+    trim = start_state(store, dt)
+    results = []
+    with restored(trim, store.pool) as fdm:
+        episode = _Episode(fdm, store.pool.properties(fdm), controls, steps, dt)
+        done = 0
+        for step in decision_steps(duration_sec, dt, decisions):
+            if not episode.fly(done, step):
+                break
+            done = step
+            stop = min(step + horizon_steps, steps)
+            jobs = [(episode, store.pool, step, stop, branch_rng(seed, index, step, k))
+                    for k in range(branches)]
+            if fork:
+                datas = fork_map(_fly_branch, jobs, workers)
+            else:
+                checkpoint = Checkpoint.capture(fdm, 'f16')
+                datas = [_fly_restored(checkpoint, *job) for job in jobs]
+            results += [(step * dt, k, data) for k, data in enumerate(datas)]
+        else:
+            episode.fly(done, steps)
+        return episode.data(), results
+
+
+def _fly_branch(job):
+    # 포크된 자식: 궤적 앞부분까지 포함한 에피소드 상태가 그대로 있다
+    episode, _, step, stop, rng = job
+    first_row = episode.recorder.count
+    episode.redraw(step, rng)
+    episode.fly(step, stop)
+    return episode.data(first_row)
+
+
+def _fly_restored(checkpoint, trunk, pool, step, stop, rng):
+    controls = {name: getattr(trunk, name).copy()
+                for name in ('elevator_target', 'aileron_target', 'elevator', 'aileron')}
+    with checkpoint.restored(pool) as fdm:
+        episode = _Episode(fdm, pool.properties(fdm), controls, trunk.steps, trunk.dt)
+        episode.redraw(step, rng)
+        episode.fly(step, stop)
+        return episode.data(copy=True)
+
+
+def _episode_job(job, store):
+    seed, index, duration_sec, dt = job
+    return run_episode(seed, index, duration_sec, dt, store)
+
+
+def iter_episodes(seed, indices, duration_sec=60, dt=0.01, workers=None):
+    """Yield the episodes ``indices`` of ``seed`` in order."""
+    jobs = ((seed, index, duration_sec, dt) for index in indices)
+    yield from iter_batch(_episode_job, jobs, workers)
+
+
+def _branched_job(job, store):
+    seed, index, branches, decisions, horizon, duration_sec, dt = job
+    return run_branched_episode(seed, index, branches, decisions, horizon, duration_sec, dt,
+                                store=store)
+
+
+def iter_branched_episodes(seed, indices, branches=10, decisions=6, horizon=None,
+                           duration_sec=60, dt=0.01, workers=None):
+    """Yield ``run_branched_episode`` of the episodes ``indices`` of ``seed`` in order."""
+    jobs = ((seed, index, branches, decisions, horizon, duration_sec, dt) for index in indices)
+    yield from iter_batch(_branched_job, jobs, workers)
+
+
+def episode_meta(seed, index, duration_sec=60, dt=0.01):
+    return {'aircraft': 'f16', 'altitude_ft': 20000.0, 'speed_kts': 450.0,
+            'ic': dict(TRIM_IC), 'throttle': THROTTLE, 'seed': seed, 'index': index,
+            'duration': duration_sec, 'dt': dt, 'decimation': DECIMATION}
+
+
+def branch_meta(meta, time, branch):
+    """Meta of branch ``branch`` taken at ``time`` s off the episode described by ``meta``."""
+    return {**meta, 'branch_time': time, 'branch': branch}
@@ -0,0 +1,269 @@
+"""Optional timing of the simulation hot loop.
+
+Profiling is off unless ``enable()`` was called (or ``SST_PROFILE`` is set
+in the environment, which worker processes inherit).  When it is off,
+``start`` returns ``None`` and the rollout loops run their callables
+untouched; when it is on, they wrap control application, ``fdm.run()``,
+property reads, recording and guard checks with ``Profile.wrap`` and time
+the loop as a whole with a ``Stopwatch``; whatever loop time the wrapped
+sections do not account for is the loop's own Python overhead.  Setup
+outside the loop (e.g. the trim lookup) uses ``Profile.section``.
+
+Each call's duration goes into a log2-bucketed ``Histogram``.  A finished
+``Profile`` (one per rollout, tagged with the scenario name and worker
+pid) is collected in-process; ``sst.batch`` ships the profiles of worker
+processes back to the parent.  ``summary`` aggregates them per scenario
+or per worker, and ``write`` exports JSON or folded stacks for
+``flamegraph.pl`` / speedscope.
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+ENV = 'SST_PROFILE'
+LOOP = 'loop'
+
+_enabled = bool(os.environ.get(ENV))
+_collected = []
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+    if flag:
+        os.environ[ENV] = '1'
+    else:
+        os.environ.pop(ENV, None)
+
+
+def enabled():
+    return _enabled
+
+
+class Histogram:
+    """Count, total, min/max and log2 buckets of durations in ns."""
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = [0] * 64
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[min(ns.bit_length(), 63)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        return self
+
+    def percentile(self, q):
+        """Upper bound (ns) of the bucket holding the ``q``-th percentile."""
+        target = q / 100.0 * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return 1 << k
+        return 0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ns': self.total,
+            'mean_ns': self.total / self.count if self.count else 0.0,
+            'min_ns': self.min or 0,
+            'max_ns': self.max,
+            'p50_ns': self.percentile(50),
+            'p99_ns': self.percentile(99),
+            # [버킷 상한 ns, 횟수]
+            'buckets': [[1 << k, n] for k, n in enumerate(self.buckets) if n],
+        }
+
+
+class Profile:
+    """Section timings of one rollout."""
+
+    def __init__(self, name, worker=None):
+        self.name = name
+        self.worker = worker or os.getpid()
+        self.sections = {}
+        self.inner = set()
+
+    def histogram(self, section):
+        hist = self.sections.get(section)
+        if hist is None:
+            hist = self.sections[section] = Histogram()
+        return hist
+
+    def wrap(self, section, fn):
+        """``fn`` with each call timed into ``section`` (a part of the loop)."""
+        self.inner.add(section)
+        add = self.histogram(section).add
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            result = fn(*args)
+            add(clock() - start)
+            return result
+        return timed
+
+    def stopwatch(self, section):
+        """A ``Stopwatch`` that adds one sample to ``section`` when done."""
+        return Stopwatch(self.histogram(section))
+
+    @contextmanager
+    def section(self, section):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.histogram(section).add(time.perf_counter_ns() - start)
+
+    def merge(self, other):
+        for section, hist in other.sections.items():
+            self.histogram(section).merge(hist)
+        self.inner |= other.inner
+        return self
+
+    def __getstate__(self):
+        return {'name': self.name, 'worker': self.worker, 'inner': self.inner,
+                'sections': {k: {s: getattr(h, s) for s in Histogram.__slots__}
+                             for k, h in self.sections.items()}}
+
+    def __setstate__(self, state):
+        self.name, self.worker, self.inner = state['name'], state['worker'], state['inner']
+        self.sections = {}
+        for section, fields in state['sections'].items():
+            hist = self.sections[section] = Histogram()
+            for slot, value in fields.items():
+                setattr(hist, slot, value)
+
+
+class Stopwatch:
+    """Accumulates running time across ``start``/``stop`` pairs.
+
+    Used for a generator's loop, which must not count the time it spends
+    suspended at a ``yield``.
+    """
+
+    def __init__(self, hist):
+        self.hist = hist
+        self.elapsed = 0
+        self.started = None
+
+    def start(self):
+        self.started = time.perf_counter_ns()
+
+    def stop(self):
+        self.elapsed += time.perf_counter_ns() - self.started
+
+    def done(self):
+        self.hist.add(self.elapsed)
+
+
+def start(name):
+    """A new ``Profile`` for rollout ``name``, or ``None`` if profiling is off."""
+    return Profile(name) if _enabled else None
+
+
+def collect(profiles):
+    _collected.extend(p for p in profiles if p is not None)
+
+
+def drain():
+    """Return and forget the profiles collected so far in this process."""
+    out = list(_collected)
+    _collected.clear()
+    return out
+
+
+def summary(profiles=None, by='name'):
+    """Merged sections per ``by`` (``'name'`` = scenario, ``'worker'`` or ``None``)."""
+    profiles = _collected if profiles is None else profiles
+    merged = {}
+    for p in profiles:
+        key = 'all' if by is None else getattr(p, by)
+        merged.setdefault(key, Profile(key, p.worker)).merge(p)
+    return merged
+
+
+def to_json(profiles=None):
+    profiles = _collected if profiles is None else profiles
+    def tables(merged):
+        return {str(key): {s: h.to_dict() for s, h in p.sections.items()}
+                for key, p in merged.items()}
+    return {
+        'total': tables(summary(profiles, None)),
+        'scenarios': tables(summary(profiles, 'name')),
+        'workers': tables(summary(profiles, 'worker')),
+    }
+
+
+def folded(profiles=None):
+    """Folded stack lines ``worker;scenario;loop;section <us>``.
+
+    Sections timed inside the loop are its children; the loop's own
+    (Python) time is what remains.
+    """
+    profiles = _collected if profiles is None else profiles
+    totals = {}
+    for p in profiles:
+        root = f'worker-{p.worker};{p.name}'
+        loop = p.sections.get(LOOP)
+        children = 0
+        for section, hist in p.sections.items():
+            if section == LOOP:
+                continue
+            inner = loop and section in p.inner
+            stack = f'{root};{LOOP};{section}' if inner else f'{root};{section}'
+            totals[stack] = totals.get(stack, 0) + hist.total
+            if inner:
+                children += hist.total
+        if loop:
+            stack = f'{root};{LOOP}'
+            totals[stack] = totals.get(stack, 0) + max(loop.total - children, 0)
+    return [f'{stack} {ns // 1000}' for stack, ns in totals.items() if ns >= 1000]
+
+
+def write(path, profiles=None):
+    """Write ``.json`` (histograms) or anything else as folded stacks."""
+    with open(path, 'w') as f:
+        if path.endswith('.json'):
+            json.dump(to_json(profiles), f, indent=1)
+        else:
+            f.write('\n'.join(folded(profiles)) + '\n')
+    return path
+
+
+def report(profiles=None, out=sys.stderr):
+    """Print where each scenario's loop time went."""
+    for name, p in summary(profiles, 'name').items():
+        loop = p.sections.get(LOOP)
+        inner = {s: h for s, h in p.sections.items() if s in p.inner}
+        total = loop.total if loop else sum(h.total for h in inner.values())
+        setup = ', '.join(f"{s} {h.total / 1e6:.1f} ms" for s, h in p.sections.items()
+                          if s != LOOP and s not in p.inner)
+        print(f"{name}: loop {total / 1e6:.1f} ms" + (f" ({setup})" if setup else ''), file=out)
+        for section, hist in sorted(inner.items(), key=lambda kv: -kv[1].total):
+            print(f"  {section:<10} {hist.total / 1e6:9.1f} ms {100 * hist.total / total:5.1f}%"
+                  f"  {hist.total / hist.count / 1e3:7.2f} us/call  p99<{hist.percentile(99) / 1e3:.1f} us",
+                  file=out)
+        if loop:
+            rest = total - sum(h.total for h in inner.values())
+            print(f"  {'python':<10} {rest / 1e6:9.1f} ms {100 * rest / total:5.1f}%", file=out)
@@ -0,0 +1,229 @@
+"""Level-flight trim points from JSBSim's trim routine, cached on disk.
+
+``TrimTable.get(aircraft, altitude_ft, speed_kts)`` returns a
+``TrimPoint``: the trimmed alpha/theta and control settings (throttle,
+pitch/roll/yaw trim, ...) for straight and level flight at that
+condition.  Points are solved once with ``fdm.do_trim`` and kept in a
+JSON file.  A condition that is not cached is answered from the table
+when possible: bilinearly interpolated if four cached points surround it
+on the altitude x speed grid, or copied from the nearest cached point
+within ``tolerance``; only otherwise is it solved.  ``grid`` and
+``prepare`` fill a table up front for an envelope sweep.
+
+Level trim solves for throttle, so the key is (aircraft, altitude,
+airspeed) and the throttle is part of the result.  Conditions the trim
+cannot meet (e.g. beyond the top speed) are cached as failures and raise
+``TrimError``.
+
+``restored`` starts a pooled executor at a trim point: the trimmed IC,
+then the engine started and the trim controls applied after ``run_ic``
+(which zeroes the FCS commands), so the first step is already in
+equilibrium instead of seconds of settling.
+"""
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import jsbsim
+
+from sst.core import default_pool
+
+TRIM_FULL = 1
+
+# (트림 후 읽을 속성, 복원할 IC 속성)
+TRIM_STATE = (
+    ('aero/alpha-deg', 'ic/alpha-deg'),
+    ('aero/beta-deg', 'ic/beta-deg'),
+    ('attitude/phi-deg', 'ic/phi-deg'),
+    ('attitude/theta-deg', 'ic/theta-deg'),
+)
+TRIM_CONTROLS = (
+    'fcs/throttle-cmd-norm',
+    'fcs/mixture-cmd-norm',
+    'fcs/elevator-cmd-norm',
+    'fcs/pitch-trim-cmd-norm',
+    'fcs/aileron-cmd-norm',
+    'fcs/roll-trim-cmd-norm',
+    'fcs/rudder-cmd-norm',
+    'fcs/yaw-trim-cmd-norm',
+)
+
+
+class TrimError(ValueError):
+    """JSBSim could not trim the aircraft at the requested condition."""
+
+
+@dataclass(frozen=True)
+class TrimPoint:
+    aircraft: str
+    altitude_ft: float
+    speed_kts: float
+    values: tuple = ()
+    source: str = 'trim'
+
+    def state(self):
+        return {ic: value for ic, value in self.values if ic.startswith('ic/')}
+
+    def controls(self):
+        return {path: value for path, value in self.values if not path.startswith('ic/')}
+
+    @property
+    def throttle(self):
+        return self.controls().get('fcs/throttle-cmd-norm')
+
+
+def trim_key(aircraft, altitude_ft, speed_kts):
+    return f'{aircraft}|{altitude_ft:g}|{speed_kts:g}'
+
+
+class TrimTable:
+    """Cached level-flight trim points; ``path`` keeps them as JSON.
+
+    ``tolerance`` is the ``(altitude_ft, speed_kts)`` distance within which
+    the nearest cached point is reused as is.
+    """
+
+    def __init__(self, path=None, pool=None, readonly=False, tolerance=(250.0, 5.0)):
+        self.path = path
+        self.readonly = readonly
+        self.pool = pool or default_pool()
+        self.tolerance = tolerance
+        self._points = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for entry in json.load(f).values():
+                    point = TrimPoint(entry['aircraft'], entry['altitude_ft'], entry['speed_kts'],
+                                      tuple(map(tuple, entry['values'])), entry['source'])
+                    self._points[trim_key(point.aircraft, point.altitude_ft,
+                                          point.speed_kts)] = point
+
+    def __len__(self):
+        return len(self._points)
+
+    def get(self, aircraft, altitude_ft, speed_kts, solve=True):
+        """Trim point for the condition: cached, interpolated, nearest or solved."""
+        point = self._points.get(trim_key(aircraft, altitude_ft, speed_kts))
+        if point is None:
+            point = (self.interpolate(aircraft, altitude_ft, speed_kts)
+                     or self.nearest(aircraft, altitude_ft, speed_kts))
+        if point is None:
+            if not solve:
+                raise KeyError(trim_key(aircraft, altitude_ft, speed_kts))
+            point = self.solve(aircraft, altitude_ft, speed_kts)
+        if point.source == 'failed':
+            raise TrimError(f"cannot trim {aircraft} at {altitude_ft:g} ft, {speed_kts:g} kts")
+        return point
+
+    def solve(self, aircraft, altitude_ft, speed_kts, save=True):
+        """Run JSBSim's full trim for the condition and cache the result."""
+        ic = {'ic/h-agl-ft': altitude_ft, 'ic/vc-kts': speed_kts,
+              'propulsion/engine[0]/set-running': 1, 'fcs/mixture-cmd-norm': 1.0}
+        with self.pool.borrow(aircraft, ic) as fdm:
+            try:
+                fdm.do_trim(TRIM_FULL)
+            except jsbsim.TrimFailureError:
+                point = TrimPoint(aircraft, altitude_ft, speed_kts, source='failed')
+            else:
+                values = [(ic_name, fdm.get_property_value(prop)) for prop, ic_name in TRIM_STATE]
+                values += [(path, fdm.get_property_value(path)) for path in TRIM_CONTROLS]
+                point = TrimPoint(aircraft, altitude_ft, speed_kts, tuple(values))
+        self._points[trim_key(aircraft, altitude_ft, speed_kts)] = point
+        if save and self.path and not self.readonly:
+            self.save()
+        return point
+
+    def grid(self, aircraft, altitudes, speeds):
+        """Solve every missing altitude x speed point; returns the failed ones."""
+        return self.prepare((aircraft, a, s) for a in altitudes for s in speeds)
+
+    def prepare(self, conditions):
+        """Solve the missing ``(aircraft, altitude_ft, speed_kts)`` conditions.
+
+        Saves once at the end and returns the conditions that failed to trim.
+        """
+        failed = []
+        for condition in dict.fromkeys(conditions):
+            point = self._points.get(trim_key(*condition))
+            if point is None:
+                point = self.solve(*condition, save=False)
+            if point.source == 'failed':
+                failed.append(condition)
+        if self.path and not self.readonly:
+            self.save()
+        return failed
+
+    def _solved(self, aircraft):
+        return {(p.altitude_ft, p.speed_kts): p for p in self._points.values()
+                if p.aircraft == aircraft and p.source == 'trim'}
+
+    def interpolate(self, aircraft, altitude_ft, speed_kts):
+        """Bilinear blend of the four cached points around the condition, or ``None``."""
+        points = self._solved(aircraft)
+        altitudes = sorted({a for a, _ in points})
+        speeds = sorted({s for _, s in points})
+        a0 = max((a for a in altitudes if a <= altitude_ft), default=None)
+        a1 = min((a for a in altitudes if a >= altitude_ft), default=None)
+        s0 = max((s for s in speeds if s <= speed_kts), default=None)
+        s1 = min((s for s in speeds if s >= speed_kts), default=None)
+        corners = [(a, s) for a in (a0, a1) for s in (s0, s1)]
+        if None in (a0, a1, s0, s1) or not all(c in points for c in corners):
+            return None
+        fa = (altitude_ft - a0) / (a1 - a0) if a1 != a0 else 0.0
+        fs = (speed_kts - s0) / (s1 - s0) if s1 != s0 else 0.0
+        # 격자선 위의 조건이면 모서리가 겹치므로 가중치를 모서리별로 더한다
+        weights = {}
+        for corner, w in (((a0, s0), (1 - fa) * (1 - fs)), ((a0, s1), (1 - fa) * fs),
+                          ((a1, s0), fa * (1 - fs)), ((a1, s1), fa * fs)):
+            weights[corner] = weights.get(corner, 0.0) + w
+        names = [name for name, _ in points[(a0, s0)].values]
+        blended = {name: 0.0 for name in names}
+        for corner, w in weights.items():
+            for name, value in points[corner].values:
+                blended[name] += w * value
+        return TrimPoint(aircraft, altitude_ft, speed_kts, tuple(blended.items()), 'interpolated')
+
+    def nearest(self, aircraft, altitude_ft, speed_kts):
+        """The closest cached point within ``tolerance``, moved to the condition, or ``None``."""
+        da, ds = self.tolerance
+        best, best_d = None, None
+        for (a, s), p in self._solved(aircraft).items():
+            d = ((a - altitude_ft) / da) ** 2 + ((s - speed_kts) / ds) ** 2
+            if d <= 1.0 and (best_d is None or d < best_d):
+                best, best_d = p, d
+        if best is None:
+            return None
+        return TrimPoint(aircraft, altitude_ft, speed_kts, best.values, 'nearest')
+
+    def restore(self, point, ic=None, dt=1.0/120.0, script=None, output=None):
+        """A pooled executor flying ``point`` (``ic`` adds position/heading)."""
+        values = dict(ic or {})
+        values.update({'ic/h-agl-ft': point.altitude_ft, 'ic/vc-kts': point.speed_kts})
+        values.update(point.state())
+        fdm = self.pool.acquire(point.aircraft, values, dt=dt, script=script, output=output)
+        props = self.pool.properties(fdm)
+        # run_ic 이 FCS 명령을 0으로 만드므로 엔진 시동과 트림 조종값은 그 다음에 넣는다
+        props.setter('propulsion/engine[0]/set-running')(1)
+        for path, value in point.controls().items():
+            props.setter(path)(value)
+        return fdm
+
+    @contextmanager
+    def restored(self, point, ic=None, dt=1.0/120.0, script=None, output=None):
+        fdm = self.restore(point, ic, dt, script, output)
+        try:
+            yield fdm
+        finally:
+            self.pool.release(fdm)
+
+    def save(self):
+        entries = {
+            key: {'aircraft': p.aircraft, 'altitude_ft': p.altitude_ft,
+                  'speed_kts': p.speed_kts, 'source': p.source,
+                  'values': [list(v) for v in p.values]}
+            for key, p in self._points.items() if p.source in ('trim', 'failed')
+        }
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=1)
+        os.replace(tmp, self.path)
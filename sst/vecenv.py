@@ -0,0 +1,308 @@
+"""Vectorized F-16 environments stepped by subprocess workers.
+
+``VecEnv(n)`` flies ``n`` F-16s from the tactical episodes' start state
+(``sst.tactical.start_state``: the settled 20,000 ft / 450 kt snapshot,
+throttle 0.9) and steps them together.  ``step(actions)`` takes an
+``(n, 4)`` array of elevator, aileron, rudder and throttle commands
+(clipped to ``action_low``/``action_high``), holds it for ``frame_skip``
+physics steps and returns ``(obs, reward, terminated, truncated, info)``
+with ``obs`` of shape ``(n, len(observation))``, the gymnasium vector
+API without depending on gymnasium.  ``observation`` is a schema spec
+(``sst.observation``); workers write the raw properties and the parent
+applies its units and normalization to the whole batch at once.
+
+The environments are split into contiguous shards, one per worker
+process.  Actions, observations and the per-environment flags live in
+one ``multiprocessing.shared_memory`` block that the parent and the
+workers both map as NumPy arrays; a step only sends each worker a
+one-byte command over its pipe and waits for a one-byte reply, so no
+array is pickled.  ``workers=1`` steps every shard in-process.
+
+An environment that leaves the flight envelope (``terminated``) or has
+flown ``duration_sec`` (``truncated``) is reset in the same step: its row
+of ``obs`` is then the first observation of the next episode, and the last
+one is in ``info['final_observation']`` (valid where
+``info['_final_observation']``).
+"""
+import multiprocessing
+import os
+import traceback
+from itertools import repeat
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from sst.guards import COMPLETED, NAN, GuardMonitor
+from sst.observation import schema_from_spec
+from sst.snapshot import SnapshotStore, default_store, restore
+from sst.tactical import GUARDS, STATE, THROTTLE, start_state
+
+ACTIONS = {
+    'elevator': 'fcs/elevator-cmd-norm',
+    'aileron': 'fcs/aileron-cmd-norm',
+    'rudder': 'fcs/rudder-cmd-norm',
+    'throttle': 'fcs/throttle-cmd-norm',
+}
+ACTION_LOW = (-1.0, -1.0, -1.0, 0.0)
+ACTION_HIGH = (1.0, 1.0, 1.0, 1.0)
+
+# 전술 에피소드의 상태 채널 + 방위/받음각/옆미끄럼각/각속도 (sst.observation 프리셋)
+OBSERVATION = [*STATE, 'heading', 'alpha', 'beta', 'p', 'q', 'r']
+
+_STEP, _RESET, _CLOSE, _OK = b's', b'r', b'c', b'k'
+
+
+def _reasons(guards):
+    # info['termination'] 이름표: 0 은 완료, 그다음 가드 이름들, 마지막이 NaN (롤아웃과 같은 이름)
+    return list(dict.fromkeys([COMPLETED, *(g.name for g in guards), NAN]))
+
+
+def _layout(num_envs, obs_dim, action_dim):
+    return (
+        ('actions', np.float64, (num_envs, action_dim)),
+        ('obs', np.float64, (num_envs, obs_dim)),
+        ('final_obs', np.float64, (num_envs, obs_dim)),
+        ('terminated', np.bool_, (num_envs,)),
+        ('truncated', np.bool_, (num_envs,)),
+        ('reason', np.int16, (num_envs,)),
+        ('steps', np.int64, (num_envs,)),
+    )
+
+
+def _nbytes(dtype, shape):
+    # 배열마다 8바이트 경계에 맞춘다
+    return -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+
+
+def _arrays(buffer, layout):
+    """Named NumPy views of ``layout`` laid out back to back in ``buffer``."""
+    arrays, offset = {}, 0
+    for name, dtype, shape in layout:
+        arrays[name] = np.ndarray(shape, dtype, buffer, offset)
+        offset += _nbytes(dtype, shape)
+    return arrays
+
+
+class _Shard:
+    """Environments ``lo:hi`` and their pooled executors, stepped in one process."""
+
+    def __init__(self, lo, hi, arrays, start, pool, config):
+        self.lo, self.hi = lo, hi
+        self.arrays = arrays
+        self.start = start
+        self.pool = pool
+        self.frame_skip, self.max_steps, self.observation, self.guards = config
+        self.codes = {name: code for code, name in enumerate(_reasons(self.guards))}
+        self.envs = [None] * (hi - lo)
+
+    def _begin(self, k):
+        env = self.envs[k - self.lo]
+        if env is not None:
+            self.pool.release(env[0])
+        fdm = restore(self.start, self.pool)
+        props = self.pool.properties(fdm)
+        props.setter(ACTIONS['throttle'])(THROTTLE)
+        setters = [props.setter(path) for path in ACTIONS.values()]
+        read_into = props.reader(self.observation).read_into
+        check = GuardMonitor(self.guards, props).check
+        self.envs[k - self.lo] = (fdm, fdm.run, setters, read_into, check)
+        self.arrays['steps'][k] = 0
+        read_into(self.arrays['obs'][k])
+
+    def reset(self):
+        for k in range(self.lo, self.hi):
+            self._begin(k)
+        for name in ('terminated', 'truncated', 'reason'):
+            self.arrays[name][self.lo:self.hi] = 0
+
+    def step(self):
+        a = self.arrays
+        obs, steps = a['obs'], a['steps']
+        actions = a['actions'][self.lo:self.hi].tolist()
+        for k, env, action in zip(range(self.lo, self.hi), self.envs, actions):
+            _, run, setters, read_into, check = env
+            for set_value, value in zip(setters, action):
+                set_value(value)
+            violation = None
+            for _ in repeat(None, self.frame_skip):
+                run()
+                violation = check()
+                if violation is not None:
+                    break
+            steps[k] += 1
+            read_into(obs[k])
+            terminated = violation is not None
+            truncated = not terminated and steps[k] >= self.max_steps
+            a['terminated'][k] = terminated
+            a['truncated'][k] = truncated
+            if terminated:
+                reason = GuardMonitor.termination(violation, None).reason
+                a['reason'][k] = self.codes[reason]
+            else:
+                a['reason'][k] = 0
+            if terminated or truncated:
+                a['final_obs'][k] = obs[k]
+                self._begin(k)
+
+    def close(self):
+        for env in self.envs:
+            if env is not None:
+                self.pool.release(env[0])
+        self.envs = [None] * (self.hi - self.lo)
+
+
+def _worker(conn, name, layout, lo, hi, start, config):
+    shm = shared_memory.SharedMemory(name=name)
+    shard = _Shard(lo, hi, _arrays(shm.buf, layout), start, SnapshotStore().pool, config)
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == _CLOSE:
+                break
+            try:
+                shard.reset() if command == _RESET else shard.step()
+            except Exception:
+                conn.send_bytes(traceback.format_exc().encode())
+            else:
+                conn.send_bytes(_OK)
+    finally:
+        shard.close()
+        # 공유 메모리를 닫기 전에 그 위의 배열 뷰를 모두 놓아야 한다
+        del shard
+        shm.close()
+        conn.close()
+
+
+class VecEnv:
+    """``num_envs`` F-16s stepped in lockstep by ``workers`` processes.
+
+    ``observation`` is the schema of each row of ``obs`` (default
+    ``OBSERVATION``; ``obs`` has the schema's common dtype), ``guards``
+    end an episode (default: the tactical envelope) and
+    ``reward(obs, actions)`` returns the ``(num_envs,)`` rewards of a step
+    (default: zeros).  ``reward`` sees the observation each environment
+    reached with ``actions``: for one reset in that step it is the final
+    observation, not the first one of the next episode.
+    ``info['termination']`` uses the rollouts' reasons (guard name,
+    ``'nan'``, ``'completed'``).  Use it as a context manager, or
+    ``close()`` it to stop the workers.
+    """
+
+    def __init__(self, num_envs, workers=None, dt=0.01, frame_skip=10, duration_sec=60.0,
+                 observation=None, guards=None, reward=None, store=None):
+        self.schema = schema_from_spec(observation or OBSERVATION)
+        self.num_envs = num_envs
+        self.observation_names = list(self.schema.names)
+        self.action_names = list(ACTIONS)
+        self.action_low = np.array(ACTION_LOW)
+        self.action_high = np.array(ACTION_HIGH)
+        self.dt = dt
+        self.frame_skip = frame_skip
+        self.reward = reward
+        self.guards = list(GUARDS if guards is None else guards)
+        max_steps = int(round(duration_sec / (dt * frame_skip)))
+        config = (frame_skip, max_steps, tuple(self.schema.paths), self.guards)
+
+        store = store or default_store()
+        start = start_state(store, dt)
+        layout = _layout(num_envs, len(self.schema), len(ACTIONS))
+        size = sum(_nbytes(dtype, shape) for _, dtype, shape in layout)
+        workers = min(workers or os.cpu_count() or 1, num_envs)
+        self._shm = None
+        self._conns, self._procs, self._shards = [], [], []
+        if workers == 1:
+            self.arrays = _arrays(bytearray(size), layout)
+            self._shards = [_Shard(0, num_envs, self.arrays, start, store.pool, config)]
+            return
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self.arrays = _arrays(self._shm.buf, layout)
+        context = multiprocessing.get_context()
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int).tolist()
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(child, self._shm.name, layout, lo, hi, start, config))
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(process)
+
+    @property
+    def obs_dim(self):
+        return len(self.observation_names)
+
+    @property
+    def action_dim(self):
+        return len(self.action_names)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _broadcast(self, command):
+        if self._shm is None:
+            for shard in self._shards:
+                shard.reset() if command == _RESET else shard.step()
+            return
+        for conn in self._conns:
+            conn.send_bytes(command)
+        replies = [conn.recv_bytes() for conn in self._conns]
+        for reply in replies:
+            if reply != _OK:
+                raise RuntimeError(f"VecEnv worker failed:\n{reply.decode()}")
+
+    def reset(self):
+        """Start every environment over; returns ``(obs, info)``."""
+        self._broadcast(_RESET)
+        return self._observe(self.arrays['obs']), {}
+
+    def step(self, actions):
+        """Apply ``(num_envs, action_dim)`` commands for ``frame_skip`` physics steps."""
+        actions = np.asarray(actions, dtype=np.float64)
+        if actions.shape != (self.num_envs, self.action_dim):
+            raise ValueError(f"actions must have shape {(self.num_envs, self.action_dim)}, "
+                             f"got {actions.shape}")
+        np.clip(actions, self.action_low, self.action_high, out=self.arrays['actions'])
+        self._broadcast(_STEP)
+
+        a = self.arrays
+        obs = self._observe(a['obs'])
+        terminated = a['terminated'].copy()
+        truncated = a['truncated'].copy()
+        done = terminated | truncated
+        names = np.array(_reasons(self.guards), dtype=object)
+        final_obs = self._observe(a['final_obs'])
+        info = {
+            'final_observation': final_obs,
+            '_final_observation': done,
+            'termination': np.where(done, names[a['reason']], None),
+        }
+        if self.reward is None:
+            reward = np.zeros(self.num_envs)
+        else:
+            reached = np.where(done[:, None], final_obs, obs)
+            reward = np.asarray(self.reward(reached, a['actions']), dtype=np.float64)
+        return obs, reward, terminated, truncated, info
+
+    def _observe(self, raw):
+        # 채널이 행인 블록으로 보고 변환한 뒤 (num_envs, obs_dim) 복사본으로 돌려준다
+        return np.array(self.schema.convert(raw.T).T, dtype=self.schema.dtype())
+
+    def close(self):
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+        for conn in self._conns:
+            conn.send_bytes(_CLOSE)
+        for process in self._procs:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+        if self._shm is not None:
+            self.arrays = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
@@ -0,0 +1,39 @@
+"""Dead-reckoned positions against the geodetic reconstruction of a real rollout."""
+import numpy as np
+import pytest
+
+from sst.frames import FT, POSITION_CHANNELS, geodetic_to_ned, integrate_velocity, ned_to_enu
+from sst.rollout import Scenario, run_scenario
+
+CHANNELS = {**POSITION_CHANNELS, 'tas': 'velocities/vt-fps', 'pitch': 'attitude/theta-deg',
+            'heading': 'attitude/psi-deg'}
+
+
+def _tracks(maneuvers):
+    data = run_scenario(Scenario('frames', 10000, 400, duration=20.0, trim=True,
+                                 ic={'ic/psi-true-deg': 30.0}, maneuvers=maneuvers,
+                                 channels=CHANNELS))
+    dt = data['t'][1] - data['t'][0]
+    north, east, _ = integrate_velocity(data['tas'] * FT, np.radians(data['pitch']),
+                                        np.radians(data['heading']), dt)
+    geodetic = geodetic_to_ned(data['lat'], data['lon'], data['h_sl'] * FT)
+    return (north - north[0], east - east[0]), geodetic
+
+
+def test_level_flight_matches_geodetic_track():
+    (north, east), (gn, ge, _) = _tracks([])
+    assert np.hypot(gn[-1], ge[-1]) > 4000.0
+    assert np.hypot(north - gn, east - ge).max() < 1.0
+
+
+def test_turn_stays_within_a_few_percent_of_geodetic_track():
+    # 선회 중에는 속도 벡터가 기수 방향과 달라 추측 항법이 조금씩 벗어난다
+    (north, east), (gn, ge, _) = _tracks([(2.0, 'fcs/aileron-cmd-norm', 0.3),
+                                          (3.0, 'fcs/aileron-cmd-norm', 0.0)])
+    flown = np.hypot(gn[-1], ge[-1])
+    assert np.hypot(north - gn, east - ge).max() < 0.03 * flown
+
+
+def test_ned_to_enu():
+    east, north, up = ned_to_enu(np.array([1.0]), np.array([2.0]), np.array([3.0]))
+    assert (east, north, up) == pytest.approx(([2.0], [1.0], [-3.0]))
@@ -0,0 +1,36 @@
+"""TrimTable interpolation on and between grid lines (no JSBSim run needed)."""
+import pytest
+
+from sst.trim import TrimPoint, TrimTable, trim_key
+
+
+def _table():
+    table = TrimTable()
+    for altitude in (10000.0, 20000.0):
+        for speed in (300.0, 400.0):
+            values = (('ic/alpha-deg', altitude / 10000.0 + speed / 100.0),
+                      ('fcs/throttle-cmd-norm', 0.5 + altitude / 100000.0 + speed / 1000.0))
+            table._points[trim_key('f16', altitude, speed)] = TrimPoint('f16', altitude, speed,
+                                                                        values)
+    return table
+
+
+@pytest.mark.parametrize('altitude, speed', [(10000.0, 300.0), (10000.0, 400.0),
+                                             (20000.0, 300.0), (20000.0, 400.0)])
+def test_exact_grid_point_matches_stored_trim(altitude, speed):
+    table = _table()
+    stored = table._points[trim_key('f16', altitude, speed)]
+    point = table.interpolate('f16', altitude, speed)
+    assert dict(point.values) == pytest.approx(dict(stored.values))
+
+
+@pytest.mark.parametrize('altitude, speed', [(15000.0, 300.0), (10000.0, 350.0),
+                                             (20000.0, 325.0), (12500.0, 400.0)])
+def test_grid_line_is_linear_between_stored_trims(altitude, speed):
+    point = _table().interpolate('f16', altitude, speed)
+    values = dict(point.values)
+    # 저장된 값이 고도/속도에 선형이므로 격자선 위의 보간도 정확히 같아야 한다
+    assert values['ic/alpha-deg'] == pytest.approx(altitude / 10000.0 + speed / 100.0)
+    assert values['fcs/throttle-cmd-norm'] == pytest.approx(
+        0.5 + altitude / 100000.0 + speed / 1000.0)
+    assert point.throttle > 0.0
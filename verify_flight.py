@@ -1,8 +1,9 @@
 import jsbsim
 import os
-import matplotlib.pyplot as plt
 import numpy as np
 
+from sst.frames import local_track
+
 def verify_jsbsim_flight():
     jsbsim_path = os.path.dirname(jsbsim.__file__)
     fdm = jsbsim.FGFDMExec(jsbsim_path)
@@ -40,22 +41,22 @@ def verify_jsbsim_flight():
         if i % 200 == 0:
             print(f"Time: {i/100:>4.1f}s | Thrust: {thrust:>6.1f} lbs | Alt: {alt:>6.1f} ft | Pitch: {pitch:>5.1f}° | Speed: {v_fps:>6.1f} fps")
             
-        # 좌표 수집 (East-North-Up)
-        # 거리를 위도/경도로부터 계산하지 않고 직접 velocity 적분 혹은 JSBSim 내부 거리 속성 사용
-        x = fdm.get_property_value('position/distance-from-start-lat-ft') * 0.3048
-        y = fdm.get_property_value('position/distance-from-start-lon-ft') * 0.3048
-        z = alt * 0.3048
-        traj.append([x, y, z])
+        # 좌표 수집: 위경도/고도를 모아 두고 루프가 끝난 뒤 한 번에 로컬 좌표로 변환
+        traj.append([fdm.get_property_value('position/lat-geod-deg'),
+                     fdm.get_property_value('position/long-gc-deg'),
+                     alt])
         
         if alt < 100:
             print("Crash detected!")
             break
 
-    return np.array(traj)
+    traj = np.array(traj)
+    return local_track(traj[:, 0], traj[:, 1], traj[:, 2])
 
 if __name__ == "__main__":
     data = verify_jsbsim_flight()
     
+    import matplotlib.pyplot as plt  # 그림을 그릴 때만 로드
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
     ax.plot(data[:, 1], data[:, 0], data[:, 2], label='C172 Flight Path', color='blue', linewidth=3)